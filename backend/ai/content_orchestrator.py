@@ -2,13 +2,19 @@
 Content Orchestrator - Planning-based social media post creation
 """
 import asyncio
-from typing import List, Dict, Any, Optional
+import logging
+import orjson
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 
 from backend.ai.factory import get_text_provider
-from backend.ai.tools.web_tools import async_web_search, async_image_search
+from backend.ai.tools.search_cache import cached_web_search, cached_image_search
+from backend.ai.utils import JsonArrayStreamParser
 from backend.models import SubTask, WebItem, ImageItem, SubTaskResults
 import uuid
 
+logger = logging.getLogger(__name__)
+
 
 # Plain dict schema for Gemini (no additionalProperties)
 SUBTASK_PLAN_SCHEMA = {
@@ -36,6 +42,129 @@ SUBTASK_PLAN_SCHEMA = {
     "required": ["sub_tasks"]
 }
 
+POST_TYPE_EXAMPLES = {
+    "Tutorial": "step-by-step instructions, key tips, common mistakes",
+    "Review": "product features, pros and cons, user testimonials",
+    "Comparison": "option A details, option B details, comparison points",
+    "News": "latest updates, background context, expert opinions",
+    "Guide": "overview, detailed steps, recommendations",
+    "How-to": "preparation, execution steps, final results"
+}
+
+# Fully formed example lines, so planning just does a dict lookup
+POST_TYPE_EXAMPLE_TEXTS = {
+    hint: f"\nExample sub-tasks for {hint}: {examples}"
+    for hint, examples in POST_TYPE_EXAMPLES.items()
+}
+
+_PLAN_PROMPT_TEMPLATE = """Break down this content request into 3-5 research sub-tasks.
+
+USER REQUEST: {user_query}
+
+INFLUENCER: {influencer_name} - {niches}
+{example_text}
+
+For each sub-task:
+1. name: Clear description (e.g., "Find latest statistics", "Research product features")
+2. queries: 2-4 search queries to find this information
+
+Guidelines:
+- Each sub-task should find specific information needed for the post
+- Queries should be 3-8 words, optimized for web search
+- Cover different aspects of the request
+- Include both fact-finding and visual research
+
+Return a JSON object with "sub_tasks" array."""
+
+# LRU cache of raw planner output keyed on (query, hint, niches). Raw dicts are
+# stored rather than SubTask objects so each hit can be issued fresh IDs.
+_PLAN_CACHE_MAX = 256
+_PLAN_CACHE: "OrderedDict[Tuple, List[Dict[str, Any]]]" = OrderedDict()
+# In-flight planner calls, so concurrent identical requests share one LLM call
+_PLAN_INFLIGHT: Dict[Tuple, asyncio.Future] = {}
+
+
+def _parse_web(raw: Any, out: List[WebItem], id_prefix: str) -> None:
+    """
+    Append WebItems parsed from an async_web_search result to `out`.
+    
+    Item IDs only need to be unique for selection, so they are derived from
+    the sub-task ID and position instead of generating a UUID per item.
+    """
+    data = orjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    
+    # Fast path: web_search always returns a list of {query, results} whose
+    # results carry title/snippet/url, so index directly without checks
+    start = len(out)
+    try:
+        # Search output is already well-typed, so skip per-item validation
+        _WI = WebItem.construct
+        for entry in data:
+            for result in entry["results"][:5]:
+                out.append(_WI(
+                    id=f"{id_prefix}-w{len(out)}",
+                    title=result["title"],
+                    snippet=result["snippet"],
+                    url=result["url"]
+                ))
+        return
+    except (TypeError, KeyError, AttributeError):
+        del out[start:]
+    _slow_parse_web(data, out, id_prefix)
+
+
+def _slow_parse_web(data: Any, out: List[WebItem], id_prefix: str) -> None:
+    """Tolerant parser for partial entries and the legacy {query: [results]} shape"""
+    _WI = WebItem.construct
+    if isinstance(data, list):
+        for entry in data:
+            if not isinstance(entry, dict):
+                continue
+            for result in entry.get("results", [])[:5]:
+                if not isinstance(result, dict):
+                    result = {}
+                out.append(_WI(
+                    id=f"{id_prefix}-w{len(out)}",
+                    title=result.get("title", ""),
+                    snippet=result.get("snippet", ""),
+                    url=result.get("url", "")
+                ))
+    elif isinstance(data, dict) and "error" not in data:
+        for results in data.values():
+            if not isinstance(results, list):
+                continue
+            for result in results[:5]:
+                if not isinstance(result, dict):
+                    result = {}
+                out.append(_WI(
+                    id=f"{id_prefix}-w{len(out)}",
+                    title=result.get("title", ""),
+                    snippet=result.get("snippet", ""),
+                    url=result.get("url", "")
+                ))
+
+
+def _image_results(raw: Any) -> List[Dict[str, Any]]:
+    """Extract the image dicts from an async_image_search result"""
+    data = orjson.loads(raw) if isinstance(raw, (str, bytes)) else raw
+    if isinstance(data, dict) and "images" in data:
+        return data["images"]
+    return []
+
+
+def _parse_images(images: List[Any], out: List[ImageItem], id_prefix: str) -> None:
+    """Append ImageItems built from raw image dicts to `out`"""
+    _II = ImageItem.construct
+    for img in images:
+        if isinstance(img, dict):
+            image_url = img.get("image_url", "")
+            out.append(_II(
+                id=f"{id_prefix}-i{len(out)}",
+                thumbnail=img.get("thumbnail_url", image_url),
+                image_url=image_url,
+                title=img.get("title", "Image")
+            ))
+
 
 class ContentOrchestrator:
     """
@@ -49,6 +178,65 @@ class ContentOrchestrator:
     def __init__(self):
         self.provider = get_text_provider()
     
+    def _build_planning_prompt(
+        self,
+        user_query: str,
+        post_type_hint: Optional[str],
+        influencer_data: Dict[str, Any]
+    ) -> str:
+        """Build the LLM prompt that breaks a request into research sub-tasks"""
+        return _PLAN_PROMPT_TEMPLATE.format(
+            user_query=user_query,
+            influencer_name=influencer_data.get('name', 'Unknown'),
+            niches=', '.join(influencer_data.get('niches', [])),
+            example_text=POST_TYPE_EXAMPLE_TEXTS.get(post_type_hint or "", "")
+        )
+    
+    @staticmethod
+    def _plan_cache_key(
+        user_query: str,
+        post_type_hint: Optional[str],
+        influencer_data: Dict[str, Any]
+    ) -> Tuple:
+        return (
+            user_query.strip().lower(),
+            post_type_hint or "",
+            tuple(sorted(influencer_data.get("niches", [])))
+        )
+    
+    @staticmethod
+    def _to_sub_task(task_data: Dict[str, Any], index: int) -> SubTask:
+        return SubTask(
+            id=str(uuid.uuid4()),
+            name=task_data.get("name", f"Sub-task {index+1}"),
+            queries=task_data.get("queries", [])[:4],  # Max 4 queries per task
+            status="pending"
+        )
+    
+    @staticmethod
+    def _fallback_plan(user_query: str) -> List[SubTask]:
+        """Simple 3-task plan used when LLM planning fails"""
+        return [
+            SubTask(
+                id=str(uuid.uuid4()),
+                name="Research main topic",
+                queries=[user_query, f"{user_query} facts"],
+                status="pending"
+            ),
+            SubTask(
+                id=str(uuid.uuid4()),
+                name="Find visual examples",
+                queries=[f"{user_query} images", f"{user_query} examples"],
+                status="pending"
+            ),
+            SubTask(
+                id=str(uuid.uuid4()),
+                name="Get expert insights",
+                queries=[f"{user_query} tips", f"{user_query} guide"],
+                status="pending"
+            )
+        ]
+    
     async def create_research_plan(
         self,
         user_query: str,
@@ -66,40 +254,98 @@ class ContentOrchestrator:
         Returns:
             List of SubTask objects
         """
-        print(f"[Orchestrator] Creating research plan for: {user_query}")
+        logger.info("[Orchestrator] Creating research plan for: %s", user_query)
         
-        post_type_examples = {
-            "Tutorial": "step-by-step instructions, key tips, common mistakes",
-            "Review": "product features, pros and cons, user testimonials",
-            "Comparison": "option A details, option B details, comparison points",
-            "News": "latest updates, background context, expert opinions",
-            "Guide": "overview, detailed steps, recommendations",
-            "How-to": "preparation, execution steps, final results"
-        }
+        planning_prompt = self._build_planning_prompt(user_query, post_type_hint, influencer_data)
+        cache_key = self._plan_cache_key(user_query, post_type_hint, influencer_data)
+        
+        try:
+            sub_tasks_data = await self._get_plan_data(cache_key, planning_prompt)
+            
+            # Convert to SubTask objects
+            sub_tasks = [
+                self._to_sub_task(task_data, i)
+                for i, task_data in enumerate(sub_tasks_data[:5])  # Max 5 tasks
+            ]
+            
+            logger.info("[Orchestrator] Created %d sub-tasks", len(sub_tasks))
+            return sub_tasks
+            
+        except Exception as e:
+            logger.warning("[Orchestrator] Planning failed: %s, using fallback", e)
+            return self._fallback_plan(user_query)
+    
+    async def stream_research_plan(
+        self,
+        user_query: str,
+        post_type_hint: Optional[str],
+        influencer_data: Dict[str, Any]
+    ) -> AsyncIterator[SubTask]:
+        """
+        Streaming variant of create_research_plan.
         
-        example_text = ""
-        if post_type_hint and post_type_hint in post_type_examples:
-            example_text = f"\nExample sub-tasks for {post_type_hint}: {post_type_examples[post_type_hint]}"
+        Yields each SubTask as soon as its JSON object is complete in the
+        model output, so callers can surface the plan while it is decoding.
+        Falls back to create_research_plan for providers without streaming.
+        """
+        if not hasattr(self.provider, "generate_stream"):
+            for sub_task in await self.create_research_plan(user_query, post_type_hint, influencer_data):
+                yield sub_task
+            return
         
-        planning_prompt = f"""Break down this content request into 3-5 research sub-tasks.
-
-USER REQUEST: {user_query}
-
-INFLUENCER: {influencer_data.get('name', 'Unknown')} - {', '.join(influencer_data.get('niches', []))}
-{example_text}
-
-For each sub-task:
-1. name: Clear description (e.g., "Find latest statistics", "Research product features")
-2. queries: 2-4 search queries to find this information
-
-Guidelines:
-- Each sub-task should find specific information needed for the post
-- Queries should be 3-8 words, optimized for web search
-- Cover different aspects of the request
-- Include both fact-finding and visual research
-
-Return a JSON object with "sub_tasks" array."""
-
+        cache_key = self._plan_cache_key(user_query, post_type_hint, influencer_data)
+        if cache_key in _PLAN_CACHE or cache_key in _PLAN_INFLIGHT:
+            for sub_task in await self.create_research_plan(user_query, post_type_hint, influencer_data):
+                yield sub_task
+            return
+        
+        logger.info("[Orchestrator] Streaming research plan for: %s", user_query)
+        planning_prompt = self._build_planning_prompt(user_query, post_type_hint, influencer_data)
+        parser = JsonArrayStreamParser("sub_tasks")
+        sub_tasks_data: List[Dict[str, Any]] = []
+        
+        try:
+            async for chunk in self.provider.generate_stream(
+                prompt=planning_prompt,
+                schema=SUBTASK_PLAN_SCHEMA
+            ):
+                for task_data in parser.feed(chunk):
+                    if len(sub_tasks_data) >= 5:  # Max 5 tasks
+                        continue
+                    sub_tasks_data.append(task_data)
+                    yield self._to_sub_task(task_data, len(sub_tasks_data) - 1)
+        except Exception as e:
+            logger.warning("[Orchestrator] Streaming plan failed: %s", e)
+            if not sub_tasks_data:
+                logger.warning("[Orchestrator] Planning failed, using fallback")
+                for sub_task in self._fallback_plan(user_query):
+                    yield sub_task
+            return
+        
+        if not sub_tasks_data:
+            logger.warning("[Orchestrator] Planning returned no sub-tasks, using fallback")
+            for sub_task in self._fallback_plan(user_query):
+                yield sub_task
+            return
+        
+        _PLAN_CACHE[cache_key] = sub_tasks_data
+        while len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+            _PLAN_CACHE.popitem(last=False)
+        logger.info("[Orchestrator] Streamed %d sub-tasks", len(sub_tasks_data))
+    
+    async def _get_plan_data(self, cache_key: Tuple, planning_prompt: str) -> List[Dict[str, Any]]:
+        """Return raw sub-task dicts for a plan, from cache or a single shared LLM call"""
+        if cache_key in _PLAN_CACHE:
+            _PLAN_CACHE.move_to_end(cache_key)
+            logger.debug("[Orchestrator] Research plan cache hit")
+            return _PLAN_CACHE[cache_key]
+        
+        inflight = _PLAN_INFLIGHT.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        _PLAN_INFLIGHT[cache_key] = future
         try:
             response = await self.provider.generate(
                 prompt=planning_prompt,
@@ -107,50 +353,29 @@ Return a JSON object with "sub_tasks" array."""
             )
             
             if isinstance(response, str):
-                import json
-                data = json.loads(response)
+                data = orjson.loads(response)
             else:
                 data = response
             
             sub_tasks_data = data.get("sub_tasks", [])
             
-            # Convert to SubTask objects
-            sub_tasks = []
-            for i, task_data in enumerate(sub_tasks_data[:5]):  # Max 5 tasks
-                sub_task = SubTask(
-                    id=str(uuid.uuid4()),
-                    name=task_data.get("name", f"Sub-task {i+1}"),
-                    queries=task_data.get("queries", [])[:4],  # Max 4 queries per task
-                    status="pending"
-                )
-                sub_tasks.append(sub_task)
-            
-            print(f"[Orchestrator] Created {len(sub_tasks)} sub-tasks")
-            return sub_tasks
+            if sub_tasks_data:
+                _PLAN_CACHE[cache_key] = sub_tasks_data
+                while len(_PLAN_CACHE) > _PLAN_CACHE_MAX:
+                    _PLAN_CACHE.popitem(last=False)
             
+            future.set_result(sub_tasks_data)
+            return sub_tasks_data
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
         except Exception as e:
-            print(f"[Orchestrator] Planning failed: {e}, using fallback")
-            # Fallback: Create simple 3-task plan
-            return [
-                SubTask(
-                    id=str(uuid.uuid4()),
-                    name="Research main topic",
-                    queries=[user_query, f"{user_query} facts"],
-                    status="pending"
-                ),
-                SubTask(
-                    id=str(uuid.uuid4()),
-                    name="Find visual examples",
-                    queries=[f"{user_query} images", f"{user_query} examples"],
-                    status="pending"
-                ),
-                SubTask(
-                    id=str(uuid.uuid4()),
-                    name="Get expert insights",
-                    queries=[f"{user_query} tips", f"{user_query} guide"],
-                    status="pending"
-                )
-            ]
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure doesn't log a warning
+            future.exception()
+            raise
+        finally:
+            _PLAN_INFLIGHT.pop(cache_key, None)
     
     async def execute_subtask_research(
         self,
@@ -165,109 +390,75 @@ Return a JSON object with "sub_tasks" array."""
         Returns:
             SubTaskResults with web items and images
         """
-        print(f"[Orchestrator] Researching sub-task: {sub_task.name}")
+        logger.info("[Orchestrator] Researching sub-task: %s", sub_task.name)
         
         queries = sub_task.queries[:4]  # Max 4 queries
         
         try:
-            import json as _json
-            
-            # Execute web search (returns JSON string)
-            web_results_raw = await async_web_search(queries)
-            
-            # Execute image searches one-by-one (each expects a single string)
+            # Execute web search (returns JSON string) and one image search per
+            # query (each expects a single string) concurrently
+            web_results_raw, *img_raws = await asyncio.gather(
+                cached_web_search(queries),
+                *[cached_image_search(q, max_results=5) for q in queries],
+                return_exceptions=True
+            )
+            if isinstance(web_results_raw, Exception):
+                raise web_results_raw
+
             image_results_all = []
-            for q in queries:
+            for q, img_raw in zip(queries, img_raws):
+                if isinstance(img_raw, Exception):
+                    logger.warning("[Orchestrator] Image search failed for '%s': %s", q, img_raw)
+                    continue
                 try:
-                    img_raw = await async_image_search(q, max_results=5)
-                    img_parsed = _json.loads(img_raw) if isinstance(img_raw, str) else img_raw
-                    if isinstance(img_parsed, dict) and "images" in img_parsed:
-                        image_results_all.extend(img_parsed["images"])
+                    image_results_all.extend(_image_results(img_raw))
                 except Exception as img_err:
-                    print(f"[Orchestrator] Image search failed for '{q}': {img_err}")
+                    logger.warning("[Orchestrator] Image search failed for '%s': %s", q, img_err)
             
             # Parse web results (JSON string → list of {query, results})
-            web_items = []
+            web_items: List[WebItem] = []
             try:
-                web_parsed = _json.loads(web_results_raw) if isinstance(web_results_raw, str) else web_results_raw
-                if isinstance(web_parsed, list):
-                    for entry in web_parsed:
-                        for result in entry.get("results", [])[:5]:
-                            web_items.append(WebItem(
-                                id=str(uuid.uuid4()),
-                                title=result.get("title", ""),
-                                snippet=result.get("snippet", ""),
-                                url=result.get("url", "")
-                            ))
-                elif isinstance(web_parsed, dict) and "error" not in web_parsed:
-                    for query_key, results in web_parsed.items():
-                        if isinstance(results, list):
-                            for result in results[:5]:
-                                web_items.append(WebItem(
-                                    id=str(uuid.uuid4()),
-                                    title=result.get("title", "") if isinstance(result, dict) else "",
-                                    snippet=result.get("snippet", "") if isinstance(result, dict) else "",
-                                    url=result.get("url", "") if isinstance(result, dict) else ""
-                                ))
+                _parse_web(web_results_raw, web_items, sub_task.id)
             except Exception as parse_err:
-                print(f"[Orchestrator] Web result parsing failed: {parse_err}")
+                logger.warning("[Orchestrator] Web result parsing failed: %s", parse_err)
             
             # Parse image results (already extracted above)
-            image_items = []
-            for img in image_results_all[:15]:
-                if isinstance(img, dict):
-                    image_items.append(ImageItem(
-                        id=str(uuid.uuid4()),
-                        thumbnail=img.get("thumbnail_url", img.get("image_url", "")),
-                        image_url=img.get("image_url", ""),
-                        title=img.get("title", "Image")
-                    ))
+            image_items: List[ImageItem] = []
+            _parse_images(image_results_all[:15], image_items, sub_task.id)
             
-            print(f"[Orchestrator] Found {len(web_items)} web items, {len(image_items)} images")
+            logger.info("[Orchestrator] Found %d web items, %d images", len(web_items), len(image_items))
             
             # Check if results are too few - maybe retry with broader query
-            if len(web_items) < 2 and len(image_items) < 2:
-                print(f"[Orchestrator] Few results, trying broader query...")
-                broader_query = queries[0].split()[:3]  # Take first 3 words
-                broader_query_str = " ".join(broader_query)
+            if queries and len(web_items) < 2 and len(image_items) < 2:
+                logger.info("[Orchestrator] Few results, trying broader query...")
+                broader_query_str = " ".join(queries[0].split()[:3])  # Take first 3 words
+                # Only started once the primary search underfills; the web and
+                # image retries are independent, so they run concurrently
+                retry_web, retry_img = await asyncio.gather(
+                    cached_web_search([broader_query_str]),
+                    cached_image_search(broader_query_str, max_results=5),
+                    return_exceptions=True
+                )
                 
                 try:
-                    retry_web_raw = await async_web_search([broader_query_str])
-                    retry_web = _json.loads(retry_web_raw) if isinstance(retry_web_raw, str) else retry_web_raw
-                    if isinstance(retry_web, list):
-                        for entry in retry_web:
-                            for result in entry.get("results", [])[:5]:
-                                web_items.append(WebItem(
-                                    id=str(uuid.uuid4()),
-                                    title=result.get("title", ""),
-                                    snippet=result.get("snippet", ""),
-                                    url=result.get("url", "")
-                                ))
+                    if not isinstance(retry_web, Exception):
+                        _parse_web(retry_web, web_items, sub_task.id)
                 except Exception:
                     pass
                 
                 try:
-                    retry_img_raw = await async_image_search(broader_query_str, max_results=5)
-                    retry_img = _json.loads(retry_img_raw) if isinstance(retry_img_raw, str) else retry_img_raw
-                    if isinstance(retry_img, dict) and "images" in retry_img:
-                        for img in retry_img["images"][:10]:
-                            if isinstance(img, dict):
-                                image_items.append(ImageItem(
-                                    id=str(uuid.uuid4()),
-                                    thumbnail=img.get("thumbnail_url", img.get("image_url", "")),
-                                    image_url=img.get("image_url", ""),
-                                    title=img.get("title", "Image")
-                                ))
+                    if not isinstance(retry_img, Exception):
+                        _parse_images(_image_results(retry_img)[:10], image_items, sub_task.id)
                 except Exception:
                     pass
             
-            return SubTaskResults(
+            return SubTaskResults.construct(
                 web_items=web_items,
                 images=image_items
             )
             
         except Exception as e:
-            print(f"[Orchestrator] Research execution failed: {e}")
+            logger.error("[Orchestrator] Research execution failed: %s", e)
             return SubTaskResults(web_items=[], images=[])
     
     async def broaden_query_and_retry(
@@ -1,13 +1,58 @@
 import os
-import json
-import base64
+import logging
+import orjson
+import pybase64
 import asyncio
-from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from typing import Dict, Any, Optional, List, AsyncIterator
 from google import genai
 from google.genai import types
 from backend.ai.interfaces import TextGenerator, ImageGenerator, VideoGenerator, ReferenceImage
 from backend.ai.utils import clean_json_string
 from backend.r2_utils import R2Utils
+from backend.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# (offset, signature, mime type) checked in order; anything else is treated as JPEG
+_IMAGE_MAGIC = (
+    (0, b'\x89PNG', 'image/png'),
+    (8, b'WEBP', 'image/webp'),
+    (0, b'GIF8', 'image/gif'),
+)
+
+_STYLE_SUFFIX = ", photorealistic, 8k, highly detailed, raw photo, shot on fujifilm, grainy texture"
+
+# Per-role instructions for how the model should use each reference image
+_ROLE_TEMPLATES = {
+    "character": (
+        "- Image {label} ({desc}): Use EXACT facial features, hair style, hair color, eye color, skin tone, and body build from this image. "
+        "For outfit, background, and pose: follow the scene description exactly - if the scene says same outfit, keep it; if it describes a new outfit, apply it.\n"
+    ),
+    "product": (
+        "- Image {label} ({desc}): Include this exact product in the scene. "
+        "Maintain brand details, colors, and design. Place it as described in the scene.\n"
+    ),
+    "person": (
+        "- Image {label} ({desc}): Use this person's EXACT facial features, hair, and build. "
+        "For outfit/context: follow the scene description exactly.\n"
+    ),
+    "location": (
+        "- Image {label} ({desc}): Use this location/background as the setting. "
+        "Match the architectural style and atmosphere. Apply any scene-specific variations as described.\n"
+    ),
+    "generic": (
+        "- Image {label} ({desc}): Include this object/element in the scene as described.\n"
+    ),
+}
+
+
+def _sniff_image_mime(image_bytes: bytes) -> str:
+    view = memoryview(image_bytes)
+    for offset, signature, mime_type in _IMAGE_MAGIC:
+        if view[offset:offset + len(signature)] == signature:
+            return mime_type
+    return 'image/jpeg'
 
 class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
     def __init__(self, api_key: str, r2_utils: Optional[R2Utils] = None):
@@ -16,8 +61,30 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
         self.text_model = "gemini-2.5-flash"
         self.image_model = "gemini-2.5-flash-image"
         self.video_model = "veo-3.1-fast-generate-preview"
+        # Configs are pydantic models, so build the common ones once instead
+        # of re-validating them on every call
+        self._cfg_plain = types.GenerateContentConfig()
+        self._schema_cfgs: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def _text_config(self, schema: Optional[Dict[str, Any]], kwargs: Dict[str, Any]) -> types.GenerateContentConfig:
+        if "tools" not in kwargs and "tool_config" not in kwargs:
+            if not schema:
+                return self._cfg_plain
+            # Keyed by identity; the schema is kept alive alongside its config
+            # so the id cannot be reused by another dict while cached
+            cached = self._schema_cfgs.get(id(schema))
+            if cached is not None and cached[0] is schema:
+                self._schema_cfgs.move_to_end(id(schema))
+                return cached[1]
+            config = types.GenerateContentConfig(
+                response_mime_type="application/json",
+                response_schema=schema
+            )
+            self._schema_cfgs[id(schema)] = (schema, config)
+            if len(self._schema_cfgs) > 32:
+                self._schema_cfgs.popitem(last=False)
+            return config
 
-    async def generate(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
         config_args = {"response_mime_type": "application/json"} if schema else {}
         if schema:
             config_args["response_schema"] = schema
@@ -30,13 +97,16 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
         if "tool_config" in kwargs:
             config_args["tool_config"] = kwargs["tool_config"]
 
+        return types.GenerateContentConfig(**config_args)
+
+    async def generate(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
         # Handle contents structure if complex parts are passed
         contents = kwargs.get("contents", prompt)
 
-        response = self.client.models.generate_content(
+        response = await self.client.aio.models.generate_content(
             model=self.text_model,
             contents=contents,
-            config=types.GenerateContentConfig(**config_args)
+            config=self._text_config(schema, kwargs)
         )
         
         # If raw response requested or tools used returning complex data
@@ -44,10 +114,32 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
             return response
 
         try:
-            return json.loads(clean_json_string(response.text))
+            return orjson.loads(clean_json_string(response.text))
         except:
             return response.text
 
+    async def generate_stream(self, prompt: str, schema: Optional[Dict[str, Any]] = None, **kwargs) -> AsyncIterator[str]:
+        """Yield response text chunks as the model decodes them."""
+        contents = kwargs.get("contents", prompt)
+
+        stream = await self.client.aio.models.generate_content_stream(
+            model=self.text_model,
+            contents=contents,
+            config=self._text_config(schema, kwargs)
+        )
+        async for chunk in stream:
+            if chunk.text:
+                yield chunk.text
+
+    @staticmethod
+    async def _decode_reference(ref: ReferenceImage) -> tuple:
+        """Return (mime_type, bytes) for a reference, decoding its data URL once"""
+        if ref.image_bytes is None or not ref.mime_type:
+            header, data = ref.image_data.split(',')
+            ref.mime_type = header.split(':')[1].split(';')[0]
+            ref.image_bytes = await asyncio.to_thread(pybase64.b64decode, data)
+        return ref.mime_type, ref.image_bytes
+
     async def generate_image(
         self, 
         prompt: str, 
@@ -59,91 +151,72 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
         
         # Handle new multi-image reference system
         if reference_images:
-            print(f"[Gemini Image] Processing {len(reference_images)} reference images")
+            logger.info("[Gemini Image] Processing %d reference images", len(reference_images))
             
             # Build reference context explanation
-            ref_context = "REFERENCE IMAGES PROVIDED:\n"
-            for ref in reference_images:
-                ref_context += f"Image {ref.label}: {ref.description} (Role: {ref.role})\n"
-            ref_context += "\n"
+            ref_context = "REFERENCE IMAGES PROVIDED:\n" + "".join(
+                f"Image {ref.label}: {ref.description} (Role: {ref.role})\n" for ref in reference_images
+            ) + "\n"
+            
+            # Decode all uncached references concurrently off the event loop;
+            # the bytes stay on the ReferenceImage so repeat generations skip it
+            decoded = await asyncio.gather(
+                *[self._decode_reference(ref) for ref in reference_images],
+                return_exceptions=True
+            )
             
             # Add each reference image as a part
-            for ref in reference_images:
+            for ref, result in zip(reference_images, decoded):
                 try:
-                    header, data = ref.image_data.split(',')
-                    mime_type = header.split(':')[1].split(';')[0]
-                    image_bytes = base64.b64decode(data)
+                    if isinstance(result, Exception):
+                        raise result
+                    mime_type, image_bytes = result
                     parts.append(types.Part.from_bytes(data=image_bytes, mime_type=mime_type))
-                    print(f"[Gemini Image] Added reference image {ref.label}: {ref.role} ({len(image_bytes)} bytes)")
+                    logger.debug("[Gemini Image] Added reference image %s: %s (%d bytes)", ref.label, ref.role, len(image_bytes))
                 except Exception as e:
-                    print(f"[Gemini Image] Failed to parse reference image {ref.label}: {e}")
+                    logger.warning("[Gemini Image] Failed to parse reference image %s: %s", ref.label, e)
             
             # Build usage instructions based on roles
-            usage_instructions = "HOW TO USE REFERENCE IMAGES:\n"
-            for ref in reference_images:
-                if ref.role == "character":
-                    usage_instructions += (
-                        f"- Image {ref.label} ({ref.description}): Use EXACT facial features, hair style, hair color, eye color, skin tone, and body build from this image. "
-                        f"For outfit, background, and pose: follow the scene description exactly - if the scene says same outfit, keep it; if it describes a new outfit, apply it.\n"
-                    )
-                elif ref.role == "product":
-                    usage_instructions += (
-                        f"- Image {ref.label} ({ref.description}): Include this exact product in the scene. "
-                        f"Maintain brand details, colors, and design. Place it as described in the scene.\n"
-                    )
-                elif ref.role == "person":
-                    usage_instructions += (
-                        f"- Image {ref.label} ({ref.description}): Use this person's EXACT facial features, hair, and build. "
-                        f"For outfit/context: follow the scene description exactly.\n"
-                    )
-                elif ref.role == "location":
-                    usage_instructions += (
-                        f"- Image {ref.label} ({ref.description}): Use this location/background as the setting. "
-                        f"Match the architectural style and atmosphere. Apply any scene-specific variations as described.\n"
-                    )
-                else:  # generic object
-                    usage_instructions += (
-                        f"- Image {ref.label} ({ref.description}): Include this object/element in the scene as described.\n"
-                    )
+            usage_instructions = "HOW TO USE REFERENCE IMAGES:\n" + "".join(
+                _ROLE_TEMPLATES.get(ref.role, _ROLE_TEMPLATES["generic"]).format(label=ref.label, desc=ref.description)
+                for ref in reference_images
+            )
             
-            style_suffix = ", photorealistic, 8k, highly detailed, raw photo, shot on fujifilm, grainy texture"
-            full_prompt = f"{ref_context}{usage_instructions}\nSCENE TO CREATE:\n{prompt}{style_suffix}"
+            full_prompt = f"{ref_context}{usage_instructions}\nSCENE TO CREATE:\n{prompt}{_STYLE_SUFFIX}"
             
         # Legacy: single reference image (backward compatibility)
         elif reference_image:
             try:
                 header, data = reference_image.split(',')
                 mime_type = header.split(':')[1].split(';')[0]
-                image_bytes = base64.b64decode(data)
+                image_bytes = await asyncio.to_thread(pybase64.b64decode, data)
                 parts.append(types.Part.from_bytes(data=image_bytes, mime_type=mime_type))
-                print(f"[Gemini Image] Added legacy reference image ({len(image_bytes)} bytes)")
+                logger.debug("[Gemini Image] Added legacy reference image (%d bytes)", len(image_bytes))
             except Exception as e:
-                print(f"[Gemini Image] Failed to parse reference image: {e}")
+                logger.warning("[Gemini Image] Failed to parse reference image: %s", e)
             
             # Explicit instructions following best practices for character consistency
-            style_suffix = ", photorealistic, 8k, highly detailed, raw photo, shot on fujifilm, grainy texture"
             full_prompt = (
                 f"REFERENCE IMAGE USAGE:\n"
                 f"- Use the EXACT person from the reference image (facial structure, facial features, hair style, hair color, eye color, skin tone, body build)\n"
                 f"- For outfit, background, and setting: follow the scene description below exactly\n"
                 f"- If the scene says 'same outfit', keep it; if it describes a specific outfit, apply it\n"
                 f"- If multiple panels, each panel description determines its own outfit/setting\n\n"
-                f"SCENE TO CREATE:\n{prompt}{style_suffix}"
+                f"SCENE TO CREATE:\n{prompt}{_STYLE_SUFFIX}"
             )
         else:
             # No reference images
-            style_suffix = ", photorealistic, 8k, highly detailed, raw photo, shot on fujifilm, grainy texture"
-            full_prompt = prompt + style_suffix
+            full_prompt = prompt + _STYLE_SUFFIX
         
         parts.append(types.Part.from_text(text=full_prompt))
 
         has_references = reference_images is not None or reference_image is not None
         ref_count = len(reference_images) if reference_images else (1 if reference_image else 0)
-        print(f"[Gemini Image] Generating with {len(parts)} parts (references: {ref_count})")
+        logger.info("[Gemini Image] Generating with %d parts (references: %s)", len(parts), ref_count)
         
         try:
             # Use response_modalities=['IMAGE'] for correct 2.0+ image generation
-            response = self.client.models.generate_content(
+            response = await self.client.aio.models.generate_content(
                 model=self.image_model,
                 contents=[types.Content(parts=parts)],
                 config=types.GenerateContentConfig(
@@ -154,7 +227,7 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
     )
             )
             
-            print(f"[Gemini Image] Response received")
+            logger.debug("[Gemini Image] Response received")
             
             image_data = None
             mime_type = "image/jpeg"
@@ -168,14 +241,14 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
                             image_data = image_obj.data
                             # Try to get mime type, default to jpeg
                             mime_type = getattr(image_obj, 'mime_type', 'image/jpeg') 
-                            print(f"[Gemini Image] Found image via as_image(): {len(image_data)} bytes")
+                            logger.debug("[Gemini Image] Found image via as_image(): %d bytes", len(image_data))
                             break
                     except Exception as e:
-                        print(f"[Gemini Image] as_image() failed: {e}, falling back to inline_data")
+                        logger.warning("[Gemini Image] as_image() failed: %s, falling back to inline_data", e)
                         if part.inline_data:
                             image_data = part.inline_data.data
                             mime_type = part.inline_data.mime_type
-                            print(f"[Gemini Image] Found inline_data: {len(image_data)} bytes, type: {mime_type}")
+                            logger.debug("[Gemini Image] Found inline_data: %d bytes, type: %s", len(image_data), mime_type)
                             break
             
             if not image_data:
@@ -185,14 +258,14 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
                         if part.inline_data:
                             image_data = part.inline_data.data
                             mime_type = part.inline_data.mime_type
-                            print(f"[Gemini Image] Found inline_data in candidates: {len(image_data)} bytes")
+                            logger.debug("[Gemini Image] Found inline_data in candidates: %d bytes", len(image_data))
                             break
             
             if not image_data:
-                print(f"[Gemini Image] ERROR - No image data found in response")
+                logger.error("[Gemini Image] ERROR - No image data found in response")
                 # Fallback: Try without reference images
                 if reference_images or reference_image:
-                    print(f"[Gemini Image] Retrying without reference images...")
+                    logger.warning("[Gemini Image] Retrying without reference images...")
                     return await self.generate_image(prompt, reference_image=None, reference_images=None, **kwargs)
                 raise Exception("No image generated")
                 
@@ -200,19 +273,19 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
                 import uuid
                 filename = f"generated/{uuid.uuid4()}.{mime_type.split('/')[-1]}"
                 url = self.r2.upload_file_to_r2(filename, image_data, content_type=mime_type)
-                print(f"[Gemini Image] Uploaded to R2: {url}")
+                logger.info("[Gemini Image] Uploaded to R2: %s", url)
                 # Return both URL and raw data for local processing
                 return {"url": url, "data": image_data, "mime_type": mime_type}
             else:
-                b64_img = base64.b64encode(image_data).decode('utf-8')
+                b64_img = pybase64.b64encode_as_string(image_data)
                 return {"url": f"data:{mime_type};base64,{b64_img}", "data": image_data, "mime_type": mime_type}
 
         
         except Exception as e:
-            print(f"[Gemini Image] Exception during generation: {type(e).__name__}: {e}")
+            logger.error("[Gemini Image] Exception during generation: %s: %s", type(e).__name__, e)
             # If reference images failed, try without them
             if reference_images or reference_image:
-                print(f"[Gemini Image] Retrying without reference images...")
+                logger.warning("[Gemini Image] Retrying without reference images...")
                 return await self.generate_image(prompt, reference_image=None, reference_images=None, **kwargs)
             raise
 
@@ -227,34 +300,30 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
         Follows the latest SDK patterns for video generation.
         """
         try:
-            import httpx
             import time
             import uuid
             
             # 1. Get the input image (handle data URIs vs HTTP URLs)
-            print(f"[Gemini Video] Processing source image: {image_url[:60]}...")
+            logger.debug("[Gemini Video] Processing source image: %s...", image_url[:60])
             
             if image_url.startswith('data:'):
                 # Handle data URI - extract and decode base64 directly
                 try:
                     header, data = image_url.split(',', 1)
-                    image_bytes = base64.b64decode(data)
-                    print(f"[Gemini Video] Decoded data URI: {len(image_bytes)} bytes")
+                    image_bytes = pybase64.b64decode(data)
+                    logger.debug("[Gemini Video] Decoded data URI: %d bytes", len(image_bytes))
                 except Exception as e:
                     raise Exception(f"Failed to decode data URI: {e}")
             else:
-                # Handle HTTP URL - fetch the image
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(image_url)
-                    if response.status_code != 200:
-                        raise Exception(f"Failed to download image: HTTP {response.status_code}")
-                    image_bytes = response.content
-                    print(f"[Gemini Video] Downloaded: {len(image_bytes)} bytes")
+                # Handle HTTP URL - fetch the image over the shared pooled client
+                response = await get_http_client().get(image_url)
+                if response.status_code != 200:
+                    raise Exception(f"Failed to download image: HTTP {response.status_code}")
+                image_bytes = response.content
+                logger.debug("[Gemini Video] Downloaded: %d bytes", len(image_bytes))
             
             # 2. Determine mime type from image bytes
-            mime_type = 'image/jpeg'
-            if image_bytes.startswith(b'\x89PNG'): mime_type = 'image/png'
-            elif len(image_bytes) > 12 and image_bytes[8:12] == b'WEBP': mime_type = 'image/webp'
+            mime_type = _sniff_image_mime(image_bytes)
             
             # 3. Start video generation with image bytes directly
             # Adjust duration to valid values for the preview model
@@ -262,9 +331,8 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
             elif duration <= 6: d_sec = 6
             else: d_sec = 8
             
-            print(f"[Gemini Video] Generating video with model: {self.video_model}, aspect ratio: {aspect_ratio}")
-            operation = await asyncio.to_thread(
-                self.client.models.generate_videos,
+            logger.info("[Gemini Video] Generating video with model: %s, aspect ratio: %s", self.video_model, aspect_ratio)
+            operation = await self.client.aio.models.generate_videos(
                 model=self.video_model,
                 prompt=prompt,
                 image=types.Image(image_bytes=image_bytes, mime_type=mime_type),
@@ -274,18 +342,21 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
                 )
             )
             
-            print(f"[Gemini Video] Operation started: {operation.name}")
+            logger.info("[Gemini Video] Operation started: %s", operation.name)
             
-            # 4. Poll for completion
+            # 4. Poll for completion with exponential backoff (2s → 15s cap) so
+            # short clips aren't held up by a long fixed interval
             start_time = time.time()
             max_wait = 600
+            delay = 2.0
             while not operation.done:
                 if time.time() - start_time > max_wait:
                     raise Exception("Video generation timed out")
                 
-                print(f"[Gemini Video] Still generating... ({int(time.time() - start_time)}s)")
-                await asyncio.sleep(10)
-                operation = await asyncio.to_thread(self.client.operations.get, operation)
+                logger.debug("[Gemini Video] Still generating... (%ds)", int(time.time() - start_time))
+                await asyncio.sleep(delay)
+                operation = await self.client.aio.operations.get(operation)
+                delay = min(delay * 1.5, 15.0)
             
             # 5. Download and save the result
             if not operation.response or not operation.response.generated_videos:
@@ -293,36 +364,37 @@ class GeminiProvider(TextGenerator, ImageGenerator, VideoGenerator):
             
             generated_video = operation.response.generated_videos[0]
             
-            print(f"[Gemini Video] Downloading video data...")
+            logger.debug("[Gemini Video] Downloading video data...")
             await asyncio.to_thread(self.client.files.download, file=generated_video.video)
             
             temp_output_path = os.path.join("uploads", f"output_{uuid.uuid4()}.mp4")
-            print(f"[Gemini Video] Saving to {temp_output_path}")
+            logger.debug("[Gemini Video] Saving to %s", temp_output_path)
             await asyncio.to_thread(generated_video.video.save, temp_output_path)
             
             # 6. Finalize (R2 or local)
             try:
-                with open(temp_output_path, "rb") as f:
-                    video_data = f.read()
-                
                 if self.r2:
                     filename = f"generated/video_{uuid.uuid4()}.mp4"
-                    url = self.r2.upload_file_to_r2(filename, video_data, content_type="video/mp4")
-                    print(f"[Gemini Video] Uploaded to R2: {url}")
+                    # Stream the file handle to R2 (multipart) instead of reading it into memory
+                    with open(temp_output_path, "rb") as f:
+                        url = await asyncio.to_thread(
+                            self.r2.upload_file_to_r2, filename, f, content_type="video/mp4"
+                        )
+                    logger.info("[Gemini Video] Uploaded to R2: %s", url)
                     return {"url": url}
                 else:
                     # Use the local file as the final result
                     final_filename = f"video_{uuid.uuid4()}.mp4"
                     final_path = os.path.join("uploads", final_filename)
                     os.rename(temp_output_path, final_path)
-                    print(f"[Gemini Video] Saved locally: {final_path}")
+                    logger.info("[Gemini Video] Saved locally: %s", final_path)
                     return {"url": f"http://localhost:8000/uploads/{final_filename}"}
             finally:
                 if os.path.exists(temp_output_path):
                     os.remove(temp_output_path)
                     
         except Exception as e:
-            print(f"[Gemini Video] Error: {type(e).__name__}: {e}")
+            logger.error("[Gemini Video] Error: %s: %s", type(e).__name__, e)
             raise
 
 
@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ReferenceImage(BaseModel):
-    image_data: str # base64 or URL
+    image_data: str = "" # base64 or URL; may be empty when image_bytes is given
     label: str
     role: str
     description: str
+    image_bytes: Optional[bytes] = Field(default=None, exclude=True) # raw bytes, or image_data decoded lazily
+    mime_type: Optional[str] = None
 
 class TextGenerator(ABC):
     @abstractmethod
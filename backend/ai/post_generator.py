@@ -2,16 +2,24 @@
 Post Generator - LLM-driven image strategy and slide generation
 """
 import asyncio
+import functools
+import logging
+import os
+import time
 import httpx
+import orjson
+from collections import OrderedDict
 from io import BytesIO
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Hashable
 from pydantic import BaseModel
 
 from backend.ai.factory import get_text_provider, get_image_provider, get_r2_utils
 from backend.ai.interfaces import ReferenceImage
 from backend.image_utils import split_grid_flexible
+from backend.http_client import get_http_client
 import uuid
-import base64
+
+logger = logging.getLogger(__name__)
 
 
 # Plain dict schemas for Gemini (no additionalProperties)
@@ -63,6 +71,141 @@ SLIDE_STRUCTURE_SCHEMA = {
 }
 
 
+# (rows, cols) and reading-order panel positions for each supported layout
+GRID_DIMS = {
+    "1x2": (1, 2),
+    "2x1": (2, 1),
+    "2x2": (2, 2),
+    "2x3": (2, 3),
+    "3x2": (3, 2),
+}
+
+GRID_POSITIONS = {
+    "1x2": ("LEFT", "RIGHT"),
+    "2x1": ("TOP", "BOTTOM"),
+    "2x2": ("TOP-LEFT", "TOP-RIGHT", "BOTTOM-LEFT", "BOTTOM-RIGHT"),
+    "2x3": ("TOP-LEFT", "TOP-CENTER", "TOP-RIGHT", "BOTTOM-LEFT", "BOTTOM-CENTER", "BOTTOM-RIGHT"),
+    "3x2": ("TOP-LEFT", "TOP-RIGHT", "MIDDLE-LEFT", "MIDDLE-RIGHT", "BOTTOM-LEFT", "BOTTOM-RIGHT"),
+}
+
+# Static instructions lead each prompt and the per-request inputs follow, so
+# the provider's prefix cache can reuse the shared part across requests
+IMAGE_STRATEGY_INSTRUCTIONS = """Analyze the selected images and decide how to use each one for creating a social media post.
+
+For each image, decide:
+1. usage_type: "reference" (use as reference image with label) or "prompt_only" (just mention in prompt)
+2. If "reference": use label "[N+1]" for image N in SELECTED IMAGES, e.g. image 1 is "[2]" (note: [1] is reserved for influencer avatar)
+3. role: "product", "location", "object", or "character"
+4. description: Brief description for the LLM to understand
+5. reasoning: Why this usage type?
+
+Guidelines:
+- Use "reference" for images that should be replicated consistently (products, specific locations, objects)
+- Use "prompt_only" for images that just inspire the style/mood
+- Limit references to max 3 images (including influencer avatar)
+- Choose the most important/relevant images as references
+
+Return a JSON object with "image_usage_plan" array.
+
+INPUTS:"""
+
+SLIDE_STRUCTURE_INSTRUCTIONS = """Create a slide structure for a social media post.
+
+Decide:
+1. slide_count: How many slides? Choose 2 (brief), 4 (standard), or 6 (detailed)
+2. grid_layout: Choose based on slide_count:
+   - 2 slides: "1x2" (vertical stack) or "2x1" (horizontal)
+   - 4 slides: "2x2" (square grid)
+   - 6 slides: "2x3" (landscape) or "3x2" (portrait)
+3. caption: Instagram-style caption with key facts and hashtags
+4. slides: Array of slide descriptions
+
+Each slide should have:
+- panel_number: 1, 2, 3, etc.
+- panel_description: What should be in this panel (1-2 sentences)
+- uses_images: Which image labels are used (e.g., ["[1]", "[2]"])
+
+Return JSON object.
+
+INPUTS:"""
+
+
+# Exact-match cache of structured LLM responses, keyed on the template plus
+# the slot values that fill it (the prompts are otherwise constant)
+_LLM_CACHE_MAX = 256
+_LLM_CACHE_TTL = 3600.0
+_LLM_CACHE: "OrderedDict[Hashable, Tuple[float, bytes]]" = OrderedDict()
+
+
+# Caps concurrent LLM calls so bursts of post generation queue locally instead
+# of tripping provider rate limits and paying for retried prompt tokens
+_LLM_SEMAPHORE = asyncio.Semaphore(int(os.getenv("AURA_LLM_CONCURRENCY", "8")))
+_LLM_MAX_ATTEMPTS = 3
+
+
+def _is_rate_limited(e: Exception) -> bool:
+    return getattr(e, "code", None) == 429 or "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e)
+
+
+async def _generate_with_backoff(text_provider, prompt: str, schema: Dict[str, Any]) -> Any:
+    """text_provider.generate under the concurrency cap, retrying 429s with exponential backoff"""
+    delay = 2.0
+    for attempt in range(1, _LLM_MAX_ATTEMPTS + 1):
+        try:
+            async with _LLM_SEMAPHORE:
+                return await text_provider.generate(prompt=prompt, schema=schema)
+        except Exception as e:
+            if attempt == _LLM_MAX_ATTEMPTS or not _is_rate_limited(e):
+                raise
+            logger.warning("[PostGenerator] Rate limited, retrying in %.0fs (%s/%s)", delay, attempt, _LLM_MAX_ATTEMPTS)
+            # Sleep outside the semaphore so other calls can proceed
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+def _safe_parse(text: str, required_key: str) -> Optional[Dict[str, Any]]:
+    """Parse an LLM JSON response, rejecting obviously malformed text before parsing"""
+    # The provider returns raw text only when its own parse already failed, so
+    # a cheap shape check skips a second full parse of truncated/prose output
+    if not text or text.lstrip()[:1] != '{' or f'"{required_key}"' not in text:
+        return None
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+
+
+async def _cached_generate(
+    text_provider,
+    cache_key: Hashable,
+    prompt: str,
+    schema: Dict[str, Any],
+    required_key: str
+) -> Dict[str, Any]:
+    """
+    text_provider.generate with an LRU in front; only well-formed responses
+    (a dict containing `required_key`) are returned and cached.
+    """
+    cached = _LLM_CACHE.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < _LLM_CACHE_TTL:
+        _LLM_CACHE.move_to_end(cache_key)
+        logger.debug("[PostGenerator] LLM cache hit for %s", cache_key[0])
+        # Stored serialized, so each hit gets a fresh copy from one C-level parse
+        return orjson.loads(cached[1])
+    
+    response = await _generate_with_backoff(text_provider, prompt, schema)
+    if isinstance(response, str):
+        response = _safe_parse(response, required_key)
+    if not isinstance(response, dict) or required_key not in response:
+        raise ValueError(f"Malformed {cache_key[0]} response")
+    
+    _LLM_CACHE[cache_key] = (time.monotonic(), orjson.dumps(response))
+    _LLM_CACHE.move_to_end(cache_key)
+    if len(_LLM_CACHE) > _LLM_CACHE_MAX:
+        _LLM_CACHE.popitem(last=False)
+    return response
+
+
 class PostGenerationResult(BaseModel):
     """Final result of post generation"""
     slide_count: int
@@ -73,22 +216,136 @@ class PostGenerationResult(BaseModel):
     image_usage_plan: List[Dict[str, Any]]
 
 
-async def download_image_as_base64(url: str) -> Optional[str]:
-    """Download image and convert to base64 data URI"""
+@functools.lru_cache(maxsize=512)
+def _influencer_block(name: str, niches: Tuple[str, ...], tone: str) -> str:
+    """Influencer profile section shared by the post planning prompts"""
+    return f"INFLUENCER PROFILE:\n- Name: {name}\n- Niches: {', '.join(niches)}\n- Style: {tone}"
+
+
+# Selected images are often reused across post runs (same product/catalog
+# shot), so keep recent downloads around, bounded by count and total size
+_IMAGE_CACHE_TTL = 3600.0
+_IMAGE_CACHE_MAX_ITEMS = 256
+_IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_IMAGE_CACHE: "OrderedDict[str, Tuple[float, bytes, str]]" = OrderedDict()
+_image_cache_bytes = 0
+
+
+def _cache_image(url: str, image_bytes: bytes, content_type: str) -> None:
+    global _image_cache_bytes
+    if len(image_bytes) > _IMAGE_CACHE_MAX_BYTES // 4:
+        return
+    old = _IMAGE_CACHE.pop(url, None)
+    if old is not None:
+        _image_cache_bytes -= len(old[1])
+    _IMAGE_CACHE[url] = (time.monotonic(), image_bytes, content_type)
+    _image_cache_bytes += len(image_bytes)
+    while _IMAGE_CACHE and (
+        len(_IMAGE_CACHE) > _IMAGE_CACHE_MAX_ITEMS or _image_cache_bytes > _IMAGE_CACHE_MAX_BYTES
+    ):
+        _, (_, evicted, _) = _IMAGE_CACHE.popitem(last=False)
+        _image_cache_bytes -= len(evicted)
+
+
+async def download_image(url: str, client: Optional[httpx.AsyncClient] = None) -> Optional[Tuple[bytes, str]]:
+    """Download image and return (bytes, content type)"""
+    cached = _IMAGE_CACHE.get(url)
+    if cached is not None and time.monotonic() - cached[0] < _IMAGE_CACHE_TTL:
+        _IMAGE_CACHE.move_to_end(url)
+        return cached[1], cached[2]
+    
+    client = client or get_http_client()
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            image_bytes = response.content
-            raw_b64 = base64.b64encode(image_bytes).decode('utf-8')
-            # Gemini expects data URI format: data:mime;base64,...
-            content_type = response.headers.get('content-type', 'image/jpeg').split(';')[0]
-            return f"data:{content_type};base64,{raw_b64}"
+        response = await client.get(url)
+        response.raise_for_status()
+        content_type = response.headers.get('content-type', 'image/jpeg').split(';')[0]
+        _cache_image(url, response.content, content_type)
+        return response.content, content_type
     except Exception as e:
-        print(f"[PostGenerator] Failed to download image {url}: {e}")
+        logger.warning("[PostGenerator] Failed to download image %s: %s", url, e)
         return None
 
 
+async def _download_grid(client: httpx.AsyncClient, url: str) -> bytes:
+    """Stream the generated grid image into memory in chunks"""
+    buf = BytesIO()
+    async with client.stream("GET", url, timeout=60.0) as response:
+        response.raise_for_status()
+        async for chunk in response.aiter_bytes(65536):
+            buf.write(chunk)
+    return buf.getvalue()
+
+
+async def _plan_image_usage(
+    text_provider,
+    cache_key: Hashable,
+    image_strategy_prompt: str,
+    selected_images: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Step 1: Image Strategy - LLM decides how to use selected images"""
+    try:
+        image_strategy_data = await _cached_generate(
+            text_provider,
+            cache_key,
+            image_strategy_prompt,
+            IMAGE_STRATEGY_SCHEMA,
+            "image_usage_plan"
+        )
+        
+        # Normalize once here so callers can rely on a list of plain dicts
+        image_usage_plan = [u for u in image_strategy_data.get("image_usage_plan", []) if isinstance(u, dict)]
+        logger.info("[PostGenerator] Image strategy determined: %d images analyzed", len(image_usage_plan))
+        return image_usage_plan
+        
+    except Exception as e:
+        logger.warning("[PostGenerator] Image strategy generation failed: %s, using default strategy", e)
+        # Fallback: Use first 2 selected images as references
+        image_usage_plan = []
+        for i, img in enumerate(selected_images[:2]):
+            image_usage_plan.append({
+                "selected_image_url": img.get("image_url", ""),
+                "usage_type": "reference",
+                "reference_label": f"[{i+2}]",
+                "role": "object",
+                "description": img.get("title", "Selected image"),
+                "reasoning": "Auto-assigned as reference"
+            })
+        return image_usage_plan
+
+
+async def _plan_slide_structure(
+    text_provider,
+    cache_key: Hashable,
+    slide_structure_prompt: str,
+    user_query: str
+) -> Tuple[int, str, str, List[Dict[str, Any]]]:
+    """Step 2: Slide Structure - Determine slide count and layout"""
+    try:
+        slide_data = await _cached_generate(
+            text_provider,
+            cache_key,
+            slide_structure_prompt,
+            SLIDE_STRUCTURE_SCHEMA,
+            "slides"
+        )
+        
+        slide_count = slide_data.get("slide_count", 4)
+        grid_layout = slide_data.get("grid_layout", "2x2")
+        caption = slide_data.get("caption", "")
+        slides = slide_data.get("slides", [])
+        
+        logger.info("[PostGenerator] Slide structure: %s slides in %s grid", slide_count, grid_layout)
+        return slide_count, grid_layout, caption, slides
+        
+    except Exception as e:
+        logger.warning("[PostGenerator] Slide structure generation failed: %s, using defaults", e)
+        slides = [
+            {"panel_number": i+1, "panel_description": f"Panel {i+1} content", "uses_images": ["[1]"]}
+            for i in range(4)
+        ]
+        return 4, "2x2", f"Check out this amazing content! {user_query}", slides
+
+
 async def generate_post_from_selections(
     influencer_avatar_b64: str,
     influencer_data: Dict[str, Any],
@@ -113,164 +370,98 @@ async def generate_post_from_selections(
     image_provider = get_image_provider()
     r2 = get_r2_utils()
     
-    print(f"[PostGenerator] Starting generation with {len(selected_images)} images, {len(selected_web_items)} web items")
+    logger.info("[PostGenerator] Starting generation with %d images, %d web items", len(selected_images), len(selected_web_items))
     
     # Step 1: Image Strategy - LLM decides how to use selected images
-    image_strategy_prompt = f"""Analyze the selected images and decide how to use each one for creating a social media post.
+    # The profile block is identical across this influencer's posts, so it goes
+    # right after the static instructions to extend the cacheable prefix
+    influencer_block = _influencer_block(
+        influencer_data.get('name', 'Unknown'),
+        tuple(influencer_data.get('niches', [])),
+        influencer_data.get('tone', 'Professional')
+    )
+    
+    image_strategy_prompt = f"""{IMAGE_STRATEGY_INSTRUCTIONS}
 
-USER QUERY: {user_query}
+{influencer_block}
 
-INFLUENCER PROFILE:
-- Name: {influencer_data.get('name', 'Unknown')}
-- Niches: {', '.join(influencer_data.get('niches', []))}
-- Style: {influencer_data.get('tone', 'Professional')}
+USER QUERY: {user_query}
 
 SELECTED IMAGES ({len(selected_images)}):
-{chr(10).join([f"{i+1}. {img.get('title', 'Image')} - {img.get('image_url', '')}" for i, img in enumerate(selected_images)])}
-
-For each image, decide:
-1. usage_type: "reference" (use as reference image with label) or "prompt_only" (just mention in prompt)
-2. If "reference": assign label like "[2]", "[3]" (note: [1] is reserved for influencer avatar)
-3. role: "product", "location", "object", or "character"
-4. description: Brief description for the LLM to understand
-5. reasoning: Why this usage type?
+{chr(10).join([f"{i+1}. {img.get('title', 'Image')} - {img.get('image_url', '')}" for i, img in enumerate(selected_images)])}"""
 
-Guidelines:
-- Use "reference" for images that should be replicated consistently (products, specific locations, objects)
-- Use "prompt_only" for images that just inspire the style/mood
-- Limit references to max 3 images (including influencer avatar)
-- Choose the most important/relevant images as references
-
-Return a JSON object with "image_usage_plan" array."""
-
-    try:
-        image_strategy_response = await text_provider.generate(
-            prompt=image_strategy_prompt,
-            schema=IMAGE_STRATEGY_SCHEMA
-        )
-        
-        if isinstance(image_strategy_response, str):
-            import json
-            image_strategy_data = json.loads(image_strategy_response)
-        else:
-            image_strategy_data = image_strategy_response
-        
-        image_usage_plan = image_strategy_data.get("image_usage_plan", [])
-        print(f"[PostGenerator] Image strategy determined: {len(image_usage_plan)} images analyzed")
-        
-    except Exception as e:
-        print(f"[PostGenerator] Image strategy generation failed: {e}, using default strategy")
-        # Fallback: Use first 2 selected images as references
-        image_usage_plan = []
-        for i, img in enumerate(selected_images[:2]):
-            image_usage_plan.append({
-                "selected_image_url": img.get("image_url", ""),
-                "usage_type": "reference",
-                "reference_label": f"[{i+2}]",
-                "role": "object",
-                "description": img.get("title", "Selected image"),
-                "reasoning": "Auto-assigned as reference"
-            })
-    
     # Step 2: Slide Structure - Determine slide count and layout
     web_context = "\n".join([
         f"- {item.get('title', '')}: {item.get('snippet', '')}"
         for item in selected_web_items[:10]
     ])
     
+    # Built from the selections rather than the image strategy so both LLM
+    # calls can run at once; labels are deterministic ([1] is the avatar)
     image_context = "\n".join([
-        f"- {usage.get('reference_label', 'Image')}: {usage.get('description', '')}"
-        for usage in image_usage_plan
+        f"- [{i+2}]: {img.get('title', 'Image')}"
+        for i, img in enumerate(selected_images)
     ])
     
-    slide_structure_prompt = f"""Create a slide structure for a social media post.
+    slide_structure_prompt = f"""{SLIDE_STRUCTURE_INSTRUCTIONS}
 
-USER QUERY: {user_query}
+{influencer_block}
 
-INFLUENCER: {influencer_data.get('name', 'Unknown')} - {', '.join(influencer_data.get('niches', []))}
+USER QUERY: {user_query}
 
 SELECTED WEB FACTS:
 {web_context}
 
 AVAILABLE IMAGES:
-{image_context}
+{image_context}"""
 
-Decide:
-1. slide_count: How many slides? Choose 2 (brief), 4 (standard), or 6 (detailed)
-2. grid_layout: Choose based on slide_count:
-   - 2 slides: "1x2" (vertical stack) or "2x1" (horizontal)
-   - 4 slides: "2x2" (square grid)
-   - 6 slides: "2x3" (landscape) or "3x2" (portrait)
-3. caption: Instagram-style caption with key facts and hashtags
-4. slides: Array of slide descriptions
-
-Each slide should have:
-- panel_number: 1, 2, 3, etc.
-- panel_description: What should be in this panel (1-2 sentences)
-- uses_images: Which image labels are used (e.g., ["[1]", "[2]"])
-
-Return JSON object."""
-
-    try:
-        slide_structure_response = await text_provider.generate(
-            prompt=slide_structure_prompt,
-            schema=SLIDE_STRUCTURE_SCHEMA
-        )
-        
-        if isinstance(slide_structure_response, str):
-            import json
-            slide_data = json.loads(slide_structure_response)
-        else:
-            slide_data = slide_structure_response
-        
-        slide_count = slide_data.get("slide_count", 4)
-        grid_layout = slide_data.get("grid_layout", "2x2")
-        caption = slide_data.get("caption", "")
-        slides = slide_data.get("slides", [])
-        
-        print(f"[PostGenerator] Slide structure: {slide_count} slides in {grid_layout} grid")
-        
-    except Exception as e:
-        print(f"[PostGenerator] Slide structure generation failed: {e}, using defaults")
-        slide_count = 4
-        grid_layout = "2x2"
-        caption = f"Check out this amazing content! {user_query}"
-        slides = [
-            {"panel_number": i+1, "panel_description": f"Panel {i+1} content", "uses_images": ["[1]"]}
-            for i in range(4)
-        ]
+    query_key = user_query.strip().lower()
+    profile_key = (
+        influencer_data.get('name', 'Unknown'),
+        influencer_data.get('tone', 'Professional'),
+        tuple(influencer_data.get('niches', []))
+    )
+    image_key = tuple((img.get('title', 'Image'), img.get('image_url', '')) for img in selected_images)
+    strategy_key = ("image_strategy", query_key, profile_key, image_key)
+    structure_key = (
+        "slide_structure",
+        query_key,
+        profile_key,
+        tuple((item.get('title', ''), item.get('snippet', '')) for item in selected_web_items[:10]),
+        tuple(title for title, _ in image_key)
+    )
     
-    # Step 3: Generate Grid Prompt
-    rows, cols = map(int, grid_layout.split("x"))
+    image_usage_plan, (slide_count, grid_layout, caption, slides) = await asyncio.gather(
+        _plan_image_usage(text_provider, strategy_key, image_strategy_prompt, selected_images),
+        _plan_slide_structure(text_provider, structure_key, slide_structure_prompt, user_query)
+    )
     
-    panel_positions = []
-    position_names = ["TOP-LEFT", "TOP-RIGHT", "MIDDLE-LEFT", "MIDDLE-RIGHT", "BOTTOM-LEFT", "BOTTOM-RIGHT"]
-    for row in range(rows):
-        for col in range(cols):
-            if rows == 1:
-                pos = "LEFT" if col == 0 else "RIGHT"
-            elif rows == 2:
-                pos = position_names[row * 2 + col] if row * 2 + col < len(position_names) else f"R{row}C{col}"
-            else:
-                pos = f"R{row+1}C{col+1}"
-            panel_positions.append(pos)
+    # Step 3: Generate Grid Prompt
+    if grid_layout not in GRID_DIMS:
+        logger.warning("[PostGenerator] Unknown grid layout %s, using 2x2", grid_layout)
+        grid_layout = "2x2"
+    rows, cols = GRID_DIMS[grid_layout]
+    panel_positions = GRID_POSITIONS[grid_layout]
     
-    grid_prompt = f"""Create a {grid_layout} grid of {slide_count} ultra-realistic smartphone photos for a social media post.
+    grid_prompt_parts = [
+        f"""Create a {grid_layout} grid of {slide_count} ultra-realistic smartphone photos for a social media post.
 
 GRID LAYOUT: {' → '.join(panel_positions)}
 
 INFLUENCER: Use character from image [1] (influencer avatar) in all panels.
 
 """
+    ]
     
     # Add panel descriptions
     for i, slide in enumerate(slides[:slide_count]):
         panel_desc = slide.get("panel_description", f"Panel {i+1}")
-        grid_prompt += f"Panel {i+1} ({panel_positions[i]}): Character from [1], {panel_desc}\n"
+        grid_prompt_parts.append(f"Panel {i+1} ({panel_positions[i]}): Character from [1], {panel_desc}\n")
     
-    grid_prompt += "\nStyle: Professional, high-quality, Instagram-ready, photorealistic, natural lighting."
+    grid_prompt_parts.append("\nStyle: Professional, high-quality, Instagram-ready, photorealistic, natural lighting.")
+    grid_prompt = "".join(grid_prompt_parts)
     
-    print(f"[PostGenerator] Grid prompt generated ({len(grid_prompt)} chars)")
+    logger.debug("[PostGenerator] Grid prompt generated (%d chars)", len(grid_prompt))
     
     # Prepare reference images
     reference_images = [
@@ -282,26 +473,35 @@ INFLUENCER: Use character from image [1] (influencer avatar) in all panels.
         )
     ]
     
-    # Add selected images as references (download and convert to base64)
-    for usage in image_usage_plan:
-        if usage.get("usage_type") == "reference" and len(reference_images) < 4:
-            image_url = usage.get("selected_image_url")
-            if image_url:
-                img_b64 = await download_image_as_base64(image_url)
-                if img_b64:
-                    reference_images.append(
-                        ReferenceImage(
-                            image_data=img_b64,
-                            label=usage.get("reference_label", f"[{len(reference_images)+1}]"),
-                            role=usage.get("role", "object"),
-                            description=usage.get("description", "Reference image")
-                        )
-                    )
+    # Add selected images as references (downloaded concurrently)
+    http = get_http_client()
+    # At most 3 selected references (4 with the avatar), bounded before download
+    reference_usages = [
+        usage for usage in image_usage_plan
+        if usage.get("usage_type") == "reference" and usage.get("selected_image_url")
+    ][:3]
+    downloaded = await asyncio.gather(*[
+        download_image(usage["selected_image_url"], http)
+        for usage in reference_usages
+    ])
+    for usage, image in zip(reference_usages, downloaded):
+        if image:
+            # Hand the raw bytes to the provider instead of a base64 data URI
+            image_bytes, content_type = image
+            reference_images.append(
+                ReferenceImage(
+                    image_bytes=image_bytes,
+                    mime_type=content_type,
+                    label=usage.get("reference_label", f"[{len(reference_images)+1}]"),
+                    role=usage.get("role", "object"),
+                    description=usage.get("description", "Reference image")
+                )
+            )
     
-    print(f"[PostGenerator] Using {len(reference_images)} reference images")
+    logger.debug("[PostGenerator] Using %d reference images", len(reference_images))
     
     # Generate grid image
-    print(f"[PostGenerator] Generating {grid_layout} grid image...")
+    logger.info("[PostGenerator] Generating %s grid image...", grid_layout)
     image_result = await image_provider.generate_image(
         prompt=grid_prompt,
         reference_images=reference_images
@@ -311,41 +511,69 @@ INFLUENCER: Use character from image [1] (influencer avatar) in all panels.
         raise Exception("Image generation failed - no URL returned")
     
     grid_image_url = image_result["url"]
-    print(f"[PostGenerator] Grid image generated: {grid_image_url}")
+    logger.debug("[PostGenerator] Grid image generated: %s", grid_image_url)
     
-    # Download grid image
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        response = await client.get(grid_image_url)
-        response.raise_for_status()
-        grid_image_bytes = response.content
+    if not r2:
+        # Without R2 there is nowhere to put the panels, so return the grid as a
+        # single slide rather than N copies of one URL for clients to re-fetch
+        logger.warning("[PostGenerator] No R2 available, returning the grid as a single slide")
+        return PostGenerationResult(
+            slide_count=1,
+            grid_layout=grid_layout,
+            slide_urls=[grid_image_url],
+            grid_url=grid_image_url,
+            caption=caption,
+            image_usage_plan=image_usage_plan
+        )
+    
+    # Providers that hand back the generated bytes (Gemini) need no re-download;
+    # otherwise start streaming the grid image right away and prepare the
+    # upload names while it is in flight
+    grid_image_bytes = image_result.get("data")
+    download_task = None
+    if not grid_image_bytes:
+        download_task = asyncio.create_task(_download_grid(http, grid_image_url))
+    
+    # One urandom read for all object keys instead of one per uuid4()
+    panel_total = rows * cols
+    raw = os.urandom(16 * (panel_total + 1))
+    ids = [uuid.UUID(bytes=raw[i*16:(i+1)*16], version=4) for i in range(panel_total + 1)]
+    slide_filenames = [f"orchestrator/slides/{ids[i]}_panel_{i+1}.jpg" for i in range(panel_total)]
+    grid_filename = f"orchestrator/grids/{ids[-1]}_grid.jpg"
+    
+    if download_task:
+        grid_image_bytes = await download_task
     
     # Split grid into panels
-    print(f"[PostGenerator] Splitting grid into {slide_count} panels...")
-    panel_bytes_list = split_grid_flexible(grid_image_bytes, rows, cols)
+    logger.debug("[PostGenerator] Splitting grid into %s panels...", slide_count)
+    # Decode/crop/re-encode is CPU-bound; Pillow releases the GIL while
+    # coding, so run it in a worker thread instead of on the event loop
+    panel_bytes_list = await asyncio.to_thread(split_grid_flexible, grid_image_bytes, rows, cols)
     
     if len(panel_bytes_list) != slide_count:
-        print(f"[PostGenerator] Warning: Expected {slide_count} panels but got {len(panel_bytes_list)}")
+        logger.warning("[PostGenerator] Warning: Expected %s panels but got %d", slide_count, len(panel_bytes_list))
     
-    # Upload panels to R2
-    slide_urls = []
-    if r2:
-        for i, panel_bytes in enumerate(panel_bytes_list):
-            filename = f"orchestrator/slides/{uuid.uuid4()}_panel_{i+1}.jpg"
-            url = r2.upload_file_to_r2(filename, panel_bytes, content_type="image/jpeg")
-            slide_urls.append(url)
-            print(f"[PostGenerator] Uploaded panel {i+1}/{len(panel_bytes_list)}")
-        
-        # Upload full grid
-        grid_filename = f"orchestrator/grids/{uuid.uuid4()}_grid.jpg"
-        uploaded_grid_url = r2.upload_file_to_r2(grid_filename, grid_image_bytes, content_type="image/jpeg")
-        print(f"[PostGenerator] Uploaded grid image")
-    else:
-        # Fallback: Use original URL
-        uploaded_grid_url = grid_image_url
-        slide_urls = [grid_image_url] * slide_count
-        print(f"[PostGenerator] Warning: No R2 available, using original URLs")
+    # Upload panels and the full grid to R2 concurrently (boto3 releases the
+    # GIL during socket I/O, so worker threads overlap the round-trips)
+    upload_coros = [
+        asyncio.to_thread(
+            r2.upload_file_to_r2,
+            filename,
+            panel_bytes,
+            content_type="image/jpeg"
+        )
+        for filename, panel_bytes in zip(slide_filenames, panel_bytes_list)
+    ]
+    upload_coros.append(asyncio.to_thread(
+        r2.upload_file_to_r2,
+        grid_filename,
+        grid_image_bytes,
+        content_type="image/jpeg"
+    ))
+    *slide_urls, uploaded_grid_url = await asyncio.gather(*upload_coros)
+    logger.info("[PostGenerator] Uploaded %d panels and grid image", len(slide_urls))
     
-    print(f"[PostGenerator] Post generation complete!")
+    logger.info("[PostGenerator] Post generation complete!")
     
     return PostGenerationResult(
         slide_count=slide_count,
@@ -353,5 +581,5 @@ INFLUENCER: Use character from image [1] (influencer avatar) in all panels.
         slide_urls=slide_urls,
         grid_url=uploaded_grid_url,
         caption=caption,
-        image_usage_plan=[u if isinstance(u, dict) else dict(u) for u in image_usage_plan]
+        image_usage_plan=image_usage_plan
     )
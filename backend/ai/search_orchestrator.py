@@ -5,18 +5,107 @@ Manages conversational flows for different content categories,
 integrates with web search tools and generates contextual options.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set, Tuple
+from collections import OrderedDict
 from enum import Enum
+from itertools import islice
 from google.genai import types
-import json
+import functools
+import hashlib
+import re
+import time
 import asyncio
 import logging
+import orjson
 
 # Import web tools
-from backend.ai.tools.web_tools import async_web_search, async_web_page_reader
+from backend.ai.tools.web_tools import async_web_search, async_web_page_reader, normalize_page_url
+from backend.ai.utils import clean_json_string
 
 logger = logging.getLogger(__name__)
 
+# Page text included in the structuring prompt; the reader stops there
+_PAGE_CONTEXT_CHARS = 3000
+# User turns listed in the post prompt (the first choice is always kept)
+_MAX_PROMPT_CHOICES = 5
+
+# Exact-match cache of structured LLM responses, keyed on sha256 of the prompt
+# and schema. Shared across orchestrator instances; entries expire after an hour.
+_LLM_CACHE_TTL = 3600.0
+_LLM_CACHE_MAX = 512
+_LLM_CACHE: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+# In-flight calls by the same key, so concurrent sessions issuing an identical
+# prompt share one provider request instead of each paying for it
+_LLM_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+
+# Static instruction blocks lead each prompt and the per-request values are
+# appended after them, so provider-side prefix caching can reuse the shared part
+_CLASSIFY_PREFIX = """Classify the content creation intent below into one category.
+
+Categories:
+- news: Sharing news, current events, breaking stories
+- guide: Tutorial, how-to, tips, educational content
+- review: Restaurant review, product review, experience review
+- event: Local events, happenings, community activities
+- travel: Travel destinations, recommendations, experiences
+- product: Product recommendations, shopping, finds
+
+Return only the category name (lowercase)."""
+
+_QUERY_GEN_PREFIX = """Generate 3-5 diverse search queries to find content for the influencer profile and category below.
+
+Generate queries that will find:
+- SPECIFIC, REAL items (actual names, places, events, products)
+- Current and relevant to the location and niches
+- Diverse perspectives and options
+- Concrete details (dates, locations, sources)
+
+Each query should be 3-8 words, optimized for web search.
+
+Examples for REVIEW category in "San Francisco":
+- "best new restaurants san francisco 2026"
+- "hidden gem cafes san francisco"
+- "top rated coffee shops bay area"
+
+Generate similar queries for the current category and context."""
+
+_STRUCTURE_PREFIX = """Analyze the web search results below and extract REAL, SPECIFIC items.
+
+Extract 10-20 specific items. Each item MUST have:
+- name: Actual name (restaurant name, event name, product name, article headline)
+- description: Brief description (50-100 chars)
+- details: Specific details (date/time, location, source, price, etc.)
+- why_notable: Why it's interesting/relevant (1 sentence)
+- url: Source URL (use actual URL from results)
+
+Focus on DIVERSITY - cover different options, perspectives, and types within the category.
+Extract MORE rather than fewer options. Aim for 15-20 items if available.
+Be SPECIFIC with real names, dates, and locations from the search results."""
+
+_FALLBACK_STRUCTURE_PREFIX = """Convert the search information below into structured JSON.
+
+Return a JSON object with an "items" array. Each item should have:
+- name: The actual name found
+- description: Brief description (50-100 chars)
+- details: Specific details like dates, locations, sources
+- why_notable: Why it's interesting (1 sentence)
+- url: Source URL if mentioned (or empty string)
+
+Focus on extracting the most specific, concrete information.
+Extract 10-20 items if available."""
+
+_ANGLE_PREFIX = """Generate 4 different angles or perspectives for creating content about the user's choice below.
+Each angle should be:
+- A different storytelling approach
+- Authentic and engaging
+- 5-8 words max
+- Suitable for social media
+
+Examples of angles: "Behind the scenes", "Personal story", "Expert tips", "Day in the life", etc.
+
+Return as JSON with "question" and "options" array."""
+
 
 class ContentCategory(str, Enum):
     """Content categories for influencer posts"""
@@ -28,6 +117,272 @@ class ContentCategory(str, Enum):
     PRODUCT = "product"  # Product recommendations
 
 
+_OPENING_TEMPLATES: Dict[ContentCategory, str] = {
+    ContentCategory.NEWS: "Hey {name}! Let's find some trending news to share with your followers. I can help you find stories related to {niches}.",
+    ContentCategory.GUIDE: "Perfect! Let's create a helpful guide for your audience. What kind of tutorial or how-to content do you want to create?",
+    ContentCategory.REVIEW: "Great choice! Let's find something worth reviewing in {location}. Whether it's a restaurant, café, or experience, I'll help you craft an authentic review.",
+    ContentCategory.EVENT: "Awesome! Let me search for local events and happenings in {location} that your followers would love to know about.",
+    ContentCategory.TRAVEL: "Let's explore! I'll help you find exciting travel destinations and experiences to share with your community.",
+    ContentCategory.PRODUCT: "Let's discover some products to recommend! I can help you find items that fit your niche and audience."
+}
+_DEFAULT_OPENING = "Let's create something amazing together!"
+
+# Generic first-turn options when search returned nothing; questions may
+# contain a {location} placeholder
+_CATEGORY_FALLBACK_OPTIONS: Dict[ContentCategory, Dict[str, Any]] = {
+    ContentCategory.NEWS: {
+        "question": "What kind of news interests you most right now?",
+        "options": (
+            "Tech & innovation news",
+            "Local community stories",
+            "Trending global topics",
+            "Industry-specific news"
+        )
+    },
+    ContentCategory.GUIDE: {
+        "question": "What guide or tutorial should we create?",
+        "options": (
+            "Quick tips & hacks",
+            "Step-by-step tutorial",
+            "Beginner's guide",
+            "Expert recommendations"
+        )
+    },
+    ContentCategory.REVIEW: {
+        "question": "What type of review in {location}?",
+        "options": (
+            "Coffee shop or café",
+            "Restaurant or food spot",
+            "Local experience or activity",
+            "Hidden gem discovery"
+        )
+    },
+    ContentCategory.EVENT: {
+        "question": "What kind of event in {location}?",
+        "options": (
+            "This weekend's events",
+            "Food & dining events",
+            "Cultural happenings",
+            "Upcoming festivals"
+        )
+    },
+    ContentCategory.TRAVEL: {
+        "question": "What travel content should we create?",
+        "options": (
+            "Weekend getaway ideas",
+            "Hidden gem destinations",
+            "Budget travel tips",
+            "Luxury experiences"
+        )
+    },
+    ContentCategory.PRODUCT: {
+        "question": "What products to feature?",
+        "options": (
+            "Daily essentials & favorites",
+            "New discoveries",
+            "Budget-friendly finds",
+            "Premium recommendations"
+        )
+    }
+}
+_DEFAULT_FALLBACK_OPTIONS: Dict[str, Any] = {
+    "question": "What would you like to focus on?",
+    "options": ("Option 1", "Option 2", "Option 3", "Option 4")
+}
+
+
+_CATEGORY_BY_VALUE: Dict[str, ContentCategory] = {c.value: c for c in ContentCategory}
+
+# Unambiguous category keywords; inputs matching exactly one category skip the
+# classification LLM call
+_CATEGORY_KEYWORDS: Dict[ContentCategory, Tuple[str, ...]] = {
+    ContentCategory.NEWS: ("news", "breaking", "headlines?"),
+    ContentCategory.GUIDE: ("how to", "how-to", "tutorials?", "guides?", "tips", "step by step"),
+    ContentCategory.REVIEW: ("reviews?", "reviewing", "rating"),
+    ContentCategory.EVENT: ("events?", "happenings?", "festivals?", "concerts?"),
+    ContentCategory.TRAVEL: ("travel", "trips?", "destinations?", "vacation", "getaway"),
+    ContentCategory.PRODUCT: ("products?", "shopping", "gadgets?"),
+}
+_CATEGORY_RE = re.compile(
+    "|".join(
+        rf"(?P<{category.value}>\b(?:{'|'.join(keywords)})\b)"
+        for category, keywords in _CATEGORY_KEYWORDS.items()
+    ),
+    re.IGNORECASE
+)
+
+
+def _keyword_category(user_input: str) -> Optional[ContentCategory]:
+    """Category whose keywords alone appear in the input, or None if none/several do"""
+    matched = {m.lastgroup for m in _CATEGORY_RE.finditer(user_input)}
+    if len(matched) == 1:
+        return _CATEGORY_BY_VALUE[matched.pop()]
+    return None
+
+
+_GROUNDED_SEARCH_PREFIX = """Search the web and find 10-15 SPECIFIC, REAL items. For each, provide:
+- name: The actual name (restaurant name, event name, product name, news headline)
+- description: Brief description (50-100 chars)
+- details: Specific details (date/time for events, location for places, source for news)
+- why_notable: Why it's interesting/relevant (1 sentence)
+- url: Source URL (or empty string)
+
+Be specific with real names, dates, and locations.
+Respond with ONLY a JSON object of the form {"items": [{"name": ..., "description": ..., "details": ..., "why_notable": ..., "url": ...}]}."""
+
+_CLASSIFY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "category": {
+            "type": "string",
+            "enum": ["news", "guide", "review", "event", "travel", "product"]
+        }
+    },
+    "required": ["category"]
+}
+
+_QUERY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "queries": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 3,
+            "maxItems": 5
+        },
+        "reasoning": {"type": "string"}
+    },
+    "required": ["queries"]
+}
+
+_STRUCTURE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "description": {"type": "string"},
+                    "details": {"type": "string"},
+                    "why_notable": {"type": "string"},
+                    "url": {"type": "string"}
+                },
+                "required": ["name", "description", "why_notable"]
+            },
+            "minItems": 6,
+            "maxItems": 20
+        }
+    },
+    "required": ["items"]
+}
+
+_ANGLE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "question": {"type": "string"},
+        "options": {
+            "type": "array",
+            "items": {"type": "string"},
+            "minItems": 4,
+            "maxItems": 4
+        }
+    },
+    "required": ["question", "options"]
+}
+
+_ITEMS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "name": {"type": "string"},
+                    "description": {"type": "string"},
+                    "details": {"type": "string"},
+                    "why_notable": {"type": "string"},
+                    "url": {"type": "string"}
+                },
+                "required": ["name", "description", "why_notable"]
+            }
+        }
+    },
+    "required": ["items"]
+}
+
+
+@functools.lru_cache(maxsize=512)
+def _build_query_prompt(
+    category_value: str,
+    name: str,
+    location: str,
+    niches: Tuple[str, ...],
+    user_refinement: Optional[str]
+) -> str:
+    """Query generation prompt; identical profiles reuse the same string"""
+    return f"""{_QUERY_GEN_PREFIX}
+
+Influencer Profile:
+- Name: {name}
+- Location: {location}
+- Niches: {', '.join(niches) if niches else 'general'}
+- Category: {category_value}
+- User refinement: {user_refinement or 'none'}
+
+Generate 3-5 diverse search queries to find {category_value} content for this profile."""
+
+
+def _parse_grounded_items(text: str) -> List[Dict[str, Any]]:
+    """Items from a grounded response that followed the JSON instructions, else []"""
+    cleaned = clean_json_string(text)
+    start = cleaned.find("{")
+    end = cleaned.rfind("}")
+    if start == -1 or end <= start:
+        return []
+    try:
+        data = orjson.loads(cleaned[start:end + 1])
+    except orjson.JSONDecodeError:
+        return []
+    items = data.get("items") if isinstance(data, dict) else None
+    if not isinstance(items, list):
+        return []
+    parsed = []
+    for item in items:
+        if isinstance(item, dict) and item.get("name") and "description" in item and "why_notable" in item:
+            item.setdefault("details", "")
+            item.setdefault("url", "")
+            parsed.append(item)
+    return parsed
+
+
+# Strong references to fire-and-forget status broadcasts until they finish
+_PENDING_BROADCASTS: Set[asyncio.Task] = set()
+
+
+def _on_broadcast_done(task: asyncio.Task) -> None:
+    _PENDING_BROADCASTS.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"[SearchOrchestrator] Status broadcast failed: {task.exception()}")
+
+
+def _broadcast_status(sse_manager, session_id: Optional[str], data: Dict[str, Any]) -> None:
+    """
+    Send an agent_status event without waiting for it.
+    
+    A slow or dead SSE subscriber can hold broadcast() for its queue timeout,
+    which must not stall the search. Tasks start in creation order and
+    broadcast() serializes on a FIFO lock, so events still arrive in order.
+    """
+    if not (sse_manager and session_id):
+        return
+    task = asyncio.create_task(sse_manager.broadcast(f"agent:{session_id}", "agent_status", data))
+    _PENDING_BROADCASTS.add(task)
+    task.add_done_callback(_on_broadcast_done)
+
+
 class SearchOrchestrator:
     """Orchestrates search-powered conversations for content creation"""
     
@@ -37,36 +392,58 @@ class SearchOrchestrator:
             text_provider: AI text provider (e.g., GeminiProvider)
         """
         self.provider = text_provider
+    
+    async def _cached_generate(self, prompt: str, schema: Dict[str, Any]) -> Any:
+        """self.provider.generate with an exact-match response cache in front"""
+        key = hashlib.sha256(
+            orjson.dumps({"prompt": prompt, "schema": schema}, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        cached = _LLM_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _LLM_CACHE_TTL:
+            _LLM_CACHE.move_to_end(key)
+            logger.debug("[SearchOrchestrator] LLM cache hit")
+            return orjson.loads(cached[1])
+        
+        task = _LLM_INFLIGHT.get(key)
+        if task is None:
+            task = asyncio.create_task(self.provider.generate(prompt, schema=schema))
+            _LLM_INFLIGHT[key] = task
+            
+            def _done(t: asyncio.Task) -> None:
+                _LLM_INFLIGHT.pop(key, None)
+                if t.cancelled() or t.exception() is not None:
+                    return
+                result = t.result()
+                # Only parsed responses are cached; raw text means the parse failed
+                if isinstance(result, dict):
+                    _LLM_CACHE[key] = (time.monotonic(), orjson.dumps(result))
+                    _LLM_CACHE.move_to_end(key)
+                    if len(_LLM_CACHE) > _LLM_CACHE_MAX:
+                        _LLM_CACHE.popitem(last=False)
+            
+            task.add_done_callback(_done)
+        else:
+            logger.debug("[SearchOrchestrator] Joining in-flight LLM call")
+        
+        # Shield so one session disconnecting doesn't cancel the shared call.
+        # Waiters get their own copy so they can't mutate each other's result.
+        result = await asyncio.shield(task)
+        return orjson.loads(orjson.dumps(result)) if isinstance(result, dict) else result
         
     async def classify_category(self, user_input: str) -> ContentCategory:
         """Classify user intent into a content category"""
-        prompt = f"""Classify this content creation intent into one category:
+        category = _keyword_category(user_input)
+        if category is not None:
+            logger.debug(f"[SearchOrchestrator] Keyword-classified as {category.value}")
+            return category
         
-User input: "{user_input}"
+        prompt = f"""{_CLASSIFY_PREFIX}
 
-Categories:
-- news: Sharing news, current events, breaking stories
-- guide: Tutorial, how-to, tips, educational content
-- review: Restaurant review, product review, experience review
-- event: Local events, happenings, community activities
-- travel: Travel destinations, recommendations, experiences
-- product: Product recommendations, shopping, finds
-
-Return only the category name (lowercase)."""
+User input: "{user_input}\""""
 
-        schema = {
-            "type": "object",
-            "properties": {
-                "category": {
-                    "type": "string",
-                    "enum": ["news", "guide", "review", "event", "travel", "product"]
-                }
-            },
-            "required": ["category"]
-        }
         
-        result = await self.provider.generate(prompt, schema=schema)
-        return ContentCategory(result["category"])
+        result = await self._cached_generate(prompt, _CLASSIFY_SCHEMA)
+        return _CATEGORY_BY_VALUE[result["category"]]
     
     async def generate_opening_message(
         self,
@@ -80,16 +457,14 @@ Return only the category name (lowercase)."""
         location = influencer_data.get("location", "your area")
         niches = influencer_data.get("niches", [])
         
-        openings = {
-            ContentCategory.NEWS: f"Hey {name}! Let's find some trending news to share with your followers. I can help you find stories related to {', '.join(niches[:2]) if niches else 'your interests'}.",
-            ContentCategory.GUIDE: f"Perfect! Let's create a helpful guide for your audience. What kind of tutorial or how-to content do you want to create?",
-            ContentCategory.REVIEW: f"Great choice! Let's find something worth reviewing in {location}. Whether it's a restaurant, café, or experience, I'll help you craft an authentic review.",
-            ContentCategory.EVENT: f"Awesome! Let me search for local events and happenings in {location} that your followers would love to know about.",
-            ContentCategory.TRAVEL: f"Let's explore! I'll help you find exciting travel destinations and experiences to share with your community.",
-            ContentCategory.PRODUCT: f"Let's discover some products to recommend! I can help you find items that fit your niche and audience."
-        }
-        
-        return openings.get(category, "Let's create something amazing together!")
+        template = _OPENING_TEMPLATES.get(category)
+        if template is None:
+            return _DEFAULT_OPENING
+        return template.format(
+            name=name,
+            location=location,
+            niches=', '.join(niches[:2]) if niches else 'your interests'
+        )
     
     async def search_real_world_data(
         self,
@@ -115,65 +490,31 @@ Return only the category name (lowercase)."""
         location = influencer_data.get("location", "")
         niches = influencer_data.get("niches", [])
         name = influencer_data.get("name", "")
+        category_value = category.value
         
         # Broadcast search start
-        if sse_manager and session_id:
-            await sse_manager.broadcast(f"agent:{session_id}", "agent_status", {
-                "phase": "generating_queries",
-                "message": "Crafting search queries..."
-            })
+        _broadcast_status(sse_manager, session_id, {
+            "phase": "generating_queries",
+            "message": "Crafting search queries..."
+        })
         
         # Step 1: Generate dynamic search queries using LLM
-        logger.info(f"[SearchOrchestrator] Generating queries for category: {category.value}")
+        logger.info(f"[SearchOrchestrator] Generating queries for category: {category_value}")
         
-        query_generation_prompt = f"""Generate 3-5 diverse search queries to find {category.value} content.
-
-Influencer Profile:
-- Name: {name}
-- Location: {location}
-- Niches: {', '.join(niches) if niches else 'general'}
-- Category: {category.value}
-- User refinement: {user_refinement or 'none'}
-
-Generate queries that will find:
-- SPECIFIC, REAL items (actual names, places, events, products)
-- Current and relevant to the location and niches
-- Diverse perspectives and options
-- Concrete details (dates, locations, sources)
-
-Each query should be 3-8 words, optimized for web search.
-
-Examples for REVIEW category in "San Francisco":
-- "best new restaurants san francisco 2026"
-- "hidden gem cafes san francisco"
-- "top rated coffee shops bay area"
-
-Generate similar queries for the current category and context."""
+        query_generation_prompt = _build_query_prompt(
+            category_value, name, location, tuple(niches), user_refinement
+        )
 
-        query_schema = {
-            "type": "object",
-            "properties": {
-                "queries": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "minItems": 3,
-                    "maxItems": 5
-                },
-                "reasoning": {"type": "string"}
-            },
-            "required": ["queries"]
-        }
         
         try:
-            query_result = await self.provider.generate(query_generation_prompt, schema=query_schema)
+            query_result = await self._cached_generate(query_generation_prompt, _QUERY_SCHEMA)
             queries = query_result.get("queries", [])
             logger.info(f"[SearchOrchestrator] Generated {len(queries)} queries: {queries}")
             
-            if sse_manager and session_id:
-                await sse_manager.broadcast(f"agent:{session_id}", "agent_status", {
-                    "phase": "searching",
-                    "message": f"🔍 Searching the web with {len(queries)} queries..."
-                })
+            _broadcast_status(sse_manager, session_id, {
+                "phase": "searching",
+                "message": f"🔍 Searching the web with {len(queries)} queries..."
+            })
             
         except Exception as e:
             logger.error(f"[SearchOrchestrator] Query generation failed: {e}")
@@ -184,7 +525,7 @@ Generate similar queries for the current category and context."""
         try:
             logger.info(f"[SearchOrchestrator] Executing web search with queries: {queries}")
             search_results_json = await async_web_search(queries)
-            search_results = json.loads(search_results_json)
+            search_results = orjson.loads(search_results_json)
             
             if isinstance(search_results, dict) and "error" in search_results:
                 raise Exception(search_results["error"])
@@ -193,19 +534,17 @@ Generate similar queries for the current category and context."""
             total_results = sum(len(q.get("results", [])) for q in search_results)
             logger.info(f"[SearchOrchestrator] Found {total_results} total search results")
             
-            if sse_manager and session_id:
-                await sse_manager.broadcast(f"agent:{session_id}", "agent_status", {
-                    "phase": "analyzing",
-                    "message": f"📊 Found {total_results} results, analyzing..."
-                })
+            _broadcast_status(sse_manager, session_id, {
+                "phase": "analyzing",
+                "message": f"📊 Found {total_results} results, analyzing..."
+            })
             
         except Exception as e:
             logger.error(f"[SearchOrchestrator] Web search failed: {e}, falling back to Google Search")
-            if sse_manager and session_id:
-                await sse_manager.broadcast(f"agent:{session_id}", "agent_status", {
-                    "phase": "searching_fallback",
-                    "message": "Using backup search method..."
-                })
+            _broadcast_status(sse_manager, session_id, {
+                "phase": "searching_fallback",
+                "message": "Using backup search method..."
+            })
             # Fallback to Google Search
             return await self._fallback_google_search(
                 category, influencer_data, user_refinement, sse_manager, session_id
@@ -213,83 +552,60 @@ Generate similar queries for the current category and context."""
         
         # Step 3: Extract top URLs for deeper content reading
         top_urls = []
+        seen_urls = set()
         for query_result in search_results[:3]:  # Top 3 query results
             for result in query_result.get("results", [])[:3]:  # Top 3 URLs each
                 url = result.get("url", "")
-                if url and url not in top_urls:
+                key = normalize_page_url(url) if url else ""
+                if key and key not in seen_urls:
+                    seen_urls.add(key)
                     top_urls.append(url)
-        
-        top_urls = top_urls[:8]  # Limit to 8 URLs total
+                if len(top_urls) >= 8:  # Limit to 8 URLs total
+                    break
+            if len(top_urls) >= 8:
+                break
         logger.info(f"[SearchOrchestrator] Reading {len(top_urls)} pages for enrichment")
         
-        # Step 4: Read page content for enrichment (optional, can be heavy)
-        page_contents = ""
+        # Step 4: Read page content for enrichment (optional, can be heavy).
+        # Pages are fetched in the background while results are formatted.
+        page_task = None
         if top_urls and len(top_urls) <= 5:  # Only read if reasonable number
+            _broadcast_status(sse_manager, session_id, {
+                "phase": "reading_pages",
+                "message": f"📖 Reading {len(top_urls)} pages for details..."
+            })
+            page_task = asyncio.create_task(async_web_page_reader(top_urls[:5], max_total_chars=_PAGE_CONTEXT_CHARS))
+        
+        # Format search results for structuring
+        formatted_results = self._format_search_results(search_results)
+        
+        page_contents = ""
+        if page_task:
             try:
-                if sse_manager and session_id:
-                    await sse_manager.broadcast(f"agent:{session_id}", "agent_status", {
-                        "phase": "reading_pages",
-                        "message": f"📖 Reading {len(top_urls)} pages for details..."
-                    })
-                page_contents = await async_web_page_reader(top_urls[:5])
+                page_contents = await page_task
                 logger.info(f"[SearchOrchestrator] Read page contents: {len(page_contents)} chars")
             except Exception as e:
                 logger.warning(f"[SearchOrchestrator] Page reading failed: {e}")
                 page_contents = ""
         
         # Step 5: Structure all results into items using LLM
-        if sse_manager and session_id:
-            await sse_manager.broadcast(f"agent:{session_id}", "agent_status", {
-                "phase": "structuring",
-                "message": "✍️ Organizing findings into options..."
-            })
-        
-        # Format search results for structuring
-        formatted_results = self._format_search_results(search_results)
+        _broadcast_status(sse_manager, session_id, {
+            "phase": "structuring",
+            "message": "✍️ Organizing findings into options..."
+        })
         
-        structure_prompt = f"""Analyze these web search results and extract REAL, SPECIFIC items.
-
-Search Results:
-{formatted_results}
-
-{f"Additional Context from Pages (first 3000 chars):\n{page_contents[:3000]}\n" if page_contents else ""}
-
-Extract 10-20 specific items. Each item MUST have:
-- name: Actual name (restaurant name, event name, product name, article headline)
-- description: Brief description (50-100 chars)
-- details: Specific details (date/time, location, source, price, etc.)
-- why_notable: Why it's interesting/relevant (1 sentence)
-- url: Source URL (use actual URL from results)
-
-Focus on DIVERSITY - cover different options, perspectives, and types within the category.
-Extract MORE rather than fewer options. Aim for 15-20 items if available.
-Be SPECIFIC with real names, dates, and locations from the search results."""
+        prompt_parts = [_STRUCTURE_PREFIX, "\n\nSearch Results:\n", formatted_results, "\n"]
+        if page_contents:
+            prompt_parts += [
+                f"\nAdditional Context from Pages (first {_PAGE_CONTEXT_CHARS} chars):\n",
+                page_contents,
+                "\n"
+            ]
+        structure_prompt = "".join(prompt_parts)
 
-        schema = {
-            "type": "object",
-            "properties": {
-                "items": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "name": {"type": "string"},
-                            "description": {"type": "string"},
-                            "details": {"type": "string"},
-                            "why_notable": {"type": "string"},
-                            "url": {"type": "string"}
-                        },
-                        "required": ["name", "description", "why_notable"]
-                    },
-                    "minItems": 6,
-                    "maxItems": 20
-                }
-            },
-            "required": ["items"]
-        }
         
         try:
-            structured_response = await self.provider.generate(structure_prompt, schema=schema)
+            structured_response = await self._cached_generate(structure_prompt, _STRUCTURE_SCHEMA)
             items = structured_response.get("items", []) if isinstance(structured_response, dict) else []
             logger.info(f"[SearchOrchestrator] Structured {len(items)} items")
             
@@ -306,6 +622,27 @@ Be SPECIFIC with real names, dates, and locations from the search results."""
             "search_method": "web_tools"
         }
     
+    async def _grounded_search(self, prompt: str) -> Any:
+        """
+        Google Search grounded generate, shared by concurrent identical prompts.
+        
+        Grounded answers go stale quickly, so unlike _cached_generate only
+        in-flight calls are shared and nothing is kept afterwards.
+        """
+        key = "grounded:" + hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+        task = _LLM_INFLIGHT.get(key)
+        if task is None:
+            task = asyncio.create_task(self.provider.generate(
+                prompt=prompt,
+                tools=[types.Tool(google_search=types.GoogleSearchRetrieval())],
+                return_raw=True
+            ))
+            _LLM_INFLIGHT[key] = task
+            task.add_done_callback(lambda _: _LLM_INFLIGHT.pop(key, None))
+        else:
+            logger.debug("[SearchOrchestrator] Joining in-flight grounded search")
+        return await asyncio.shield(task)
+    
     def _get_fallback_query(
         self, 
         category: ContentCategory, 
@@ -314,28 +651,36 @@ Be SPECIFIC with real names, dates, and locations from the search results."""
         user_refinement: Optional[str]
     ) -> str:
         """Generate fallback query based on category"""
-        search_queries = {
-            ContentCategory.NEWS: f"latest news trending {' '.join(niches[:2]) if niches else ''} {user_refinement or ''}",
-            ContentCategory.GUIDE: f"how to tutorial {user_refinement or ' '.join(niches[:1]) if niches else ''}",
-            ContentCategory.REVIEW: f"best restaurants cafes {location} {user_refinement or ''}",
-            ContentCategory.EVENT: f"events happenings {location} today this week {user_refinement or ''}",
-            ContentCategory.TRAVEL: f"travel destinations recommendations {user_refinement or ''}",
-            ContentCategory.PRODUCT: f"best products recommendations {' '.join(niches[:1]) if niches else ''} {user_refinement or ''}"
-        }
-        return search_queries.get(category, user_refinement or "trending topics")
+        # Only the selected category's query is formatted
+        match category:
+            case ContentCategory.NEWS:
+                return f"latest news trending {' '.join(niches[:2]) if niches else ''} {user_refinement or ''}"
+            case ContentCategory.GUIDE:
+                return f"how to tutorial {user_refinement or ' '.join(niches[:1]) if niches else ''}"
+            case ContentCategory.REVIEW:
+                return f"best restaurants cafes {location} {user_refinement or ''}"
+            case ContentCategory.EVENT:
+                return f"events happenings {location} today this week {user_refinement or ''}"
+            case ContentCategory.TRAVEL:
+                return f"travel destinations recommendations {user_refinement or ''}"
+            case ContentCategory.PRODUCT:
+                return f"best products recommendations {' '.join(niches[:1]) if niches else ''} {user_refinement or ''}"
+        return user_refinement or "trending topics"
     
     def _format_search_results(self, search_results: List[Dict]) -> str:
         """Format search results for LLM consumption"""
+        # One formatted block per result instead of one append per line
         formatted = []
+        append = formatted.append
         for i, query_result in enumerate(search_results, 1):
-            query = query_result.get("query", "")
-            results = query_result.get("results", [])
-            formatted.append(f"Query {i}: {query}")
-            for j, result in enumerate(results[:5], 1):
-                formatted.append(f"  {j}. {result.get('title', '')}")
-                formatted.append(f"     {result.get('snippet', '')[:200]}")
-                formatted.append(f"     URL: {result.get('url', '')}")
-            formatted.append("")
+            append(f"Query {i}: {query_result.get('query', '')}")
+            for j, result in enumerate(query_result.get("results", [])[:5], 1):
+                append(
+                    f"  {j}. {result.get('title', '')}\n"
+                    f"     {result.get('snippet', '')[:200]}\n"
+                    f"     URL: {result.get('url', '')}"
+                )
+            append("")
         return "\n".join(formatted)
     
     async def _fallback_google_search(
@@ -352,67 +697,27 @@ Be SPECIFIC with real names, dates, and locations from the search results."""
         
         query = self._get_fallback_query(category, location, niches, user_refinement)
         
-        # Step 1: Use Gemini's Google Search grounding (without schema)
-        search_prompt = f"""Search the web for: {query}
-
-Find 10-15 SPECIFIC, REAL items. For each, provide:
-- The actual name (restaurant name, event name, product name, news headline)
-- Brief description
-- Specific details (date/time for events, location for places, source for news)
-- Why it's interesting/relevant
+        # Step 1: Use Gemini's Google Search grounding. Tools can't be combined
+        # with a response schema, so the prompt asks for the JSON shape directly
+        search_prompt = f"""{_GROUNDED_SEARCH_PREFIX}
 
-Be specific with real names, dates, and locations."""
+Search the web for: {query}"""
 
-        search_response = await self.provider.generate(
-            prompt=search_prompt,
-            tools=[types.Tool(google_search=types.GoogleSearchRetrieval())],
-            return_raw=True
-        )
+        search_response = await self._grounded_search(search_prompt)
         
-        search_text = search_response.text if hasattr(search_response, 'text') else str(search_response)
+        search_text = (search_response.text if hasattr(search_response, 'text') else str(search_response)) or ""
+        items = _parse_grounded_items(search_text)
         
-        # Step 2: Structure the search results into JSON (separate call without tools)
-        structure_prompt = f"""Convert this search information into structured JSON:
-
-{search_text}
-
-Return a JSON object with an "items" array. Each item should have:
-- name: The actual name found
-- description: Brief description (50-100 chars)
-- details: Specific details like dates, locations, sources
-- why_notable: Why it's interesting (1 sentence)
-- url: Source URL if mentioned (or empty string)
-
-Focus on extracting the most specific, concrete information.
-Extract 10-20 items if available."""
+        if not items:
+            # Step 2: Structure free-form output into JSON (separate call without tools)
+            logger.info("[SearchOrchestrator] Grounded response was not JSON, structuring in a second call")
+            structure_prompt = f"""{_FALLBACK_STRUCTURE_PREFIX}
 
-        schema = {
-            "type": "object",
-            "properties": {
-                "items": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "name": {"type": "string"},
-                            "description": {"type": "string"},
-                            "details": {"type": "string"},
-                            "why_notable": {"type": "string"},
-                            "url": {"type": "string"}
-                        },
-                        "required": ["name", "description", "why_notable"]
-                    }
-                }
-            },
-            "required": ["items"]
-        }
+Search information:
+{search_text}"""
 
-        structured_response = await self.provider.generate(
-            prompt=structure_prompt,
-            schema=schema
-        )
-        
-        items = structured_response.get("items", []) if isinstance(structured_response, dict) else []
+            structured_response = await self._cached_generate(structure_prompt, _ITEMS_SCHEMA)
+            items = structured_response.get("items", []) if isinstance(structured_response, dict) else []
         
         return {
             "items": items,
@@ -509,69 +814,12 @@ Extract 10-20 items if available."""
             }
         
         # Fallback to generic options if no search data
-        fallback_options = {
-            ContentCategory.NEWS: {
-                "question": f"What kind of news interests you most right now?",
-                "options": [
-                    "Tech & innovation news",
-                    "Local community stories",
-                    "Trending global topics",
-                    "Industry-specific news"
-                ]
-            },
-            ContentCategory.GUIDE: {
-                "question": f"What guide or tutorial should we create?",
-                "options": [
-                    "Quick tips & hacks",
-                    "Step-by-step tutorial",
-                    "Beginner's guide",
-                    "Expert recommendations"
-                ]
-            },
-            ContentCategory.REVIEW: {
-                "question": f"What type of review in {location}?",
-                "options": [
-                    "Coffee shop or café",
-                    "Restaurant or food spot",
-                    "Local experience or activity",
-                    "Hidden gem discovery"
-                ]
-            },
-            ContentCategory.EVENT: {
-                "question": f"What kind of event in {location}?",
-                "options": [
-                    "This weekend's events",
-                    "Food & dining events",
-                    "Cultural happenings",
-                    "Upcoming festivals"
-                ]
-            },
-            ContentCategory.TRAVEL: {
-                "question": f"What travel content should we create?",
-                "options": [
-                    "Weekend getaway ideas",
-                    "Hidden gem destinations",
-                    "Budget travel tips",
-                    "Luxury experiences"
-                ]
-            },
-            ContentCategory.PRODUCT: {
-                "question": f"What products to feature?",
-                "options": [
-                    "Daily essentials & favorites",
-                    "New discoveries",
-                    "Budget-friendly finds",
-                    "Premium recommendations"
-                ]
-            }
+        result = _CATEGORY_FALLBACK_OPTIONS.get(category, _DEFAULT_FALLBACK_OPTIONS)
+        return {
+            "question": result["question"].format(location=location),
+            "options": list(result["options"]),
+            "can_generate": False
         }
-        
-        result = fallback_options.get(category, {
-            "question": "What would you like to focus on?",
-            "options": ["Option 1", "Option 2", "Option 3", "Option 4"]
-        })
-        
-        return {**result, "can_generate": False}
     
     async def _generate_angle_options(
         self,
@@ -584,34 +832,12 @@ Extract 10-20 items if available."""
         
         first_choice = conversation_history[0].get("content", "") if conversation_history else ""
         
-        prompt = f"""The user chose: "{first_choice}"
+        prompt = f"""{_ANGLE_PREFIX}
 
-Generate 4 different angles or perspectives for creating content about this.
-Each angle should be:
-- A different storytelling approach
-- Authentic and engaging
-- 5-8 words max
-- Suitable for social media
-
-Examples of angles: "Behind the scenes", "Personal story", "Expert tips", "Day in the life", etc.
+The user chose: "{first_choice}\""""
 
-Return as JSON with "question" and "options" array."""
-
-        schema = {
-            "type": "object",
-            "properties": {
-                "question": {"type": "string"},
-                "options": {
-                    "type": "array",
-                    "items": {"type": "string"},
-                    "minItems": 4,
-                    "maxItems": 4
-                }
-            },
-            "required": ["question", "options"]
-        }
         
-        result = await self.provider.generate(prompt, schema=schema)
+        result = await self._cached_generate(prompt, _ANGLE_SCHEMA)
         return {
             **result,
             "can_generate": True  # Can generate after choosing angle
@@ -636,19 +862,42 @@ Return as JSON with "question" and "options" array."""
         tone = influencer_data.get("tone", "casual")
         
         # Extract key decisions from conversation
-        choices = [msg.get("content", "") for msg in conversation_history if msg.get("role") == "user"]
+        # The first choice picks the subject; after that only the latest few
+        # turns go into the prompt, so long sessions don't grow it unboundedly
+        user_turns = (msg.get("content", "") for msg in conversation_history if msg.get("role") == "user")
+        first_choice = next(user_turns, "")
+        recent = list(islice(
+            (msg.get("content", "") for msg in reversed(conversation_history) if msg.get("role") == "user"),
+            _MAX_PROMPT_CHOICES
+        ))
+        recent.reverse()
+        if len(recent) < _MAX_PROMPT_CHOICES or recent[0] == first_choice:
+            choices = recent
+        else:
+            choices = [first_choice] + recent[1:]
+        choices_block = "\n".join(f"- {choice}" for choice in choices)
         
         # Format real-world data
         real_world_context = "REAL-WORLD INFORMATION TO USE:\n"
         if search_data and search_data.get("items"):
             items = search_data["items"]
             # Find the item user selected (first choice)
-            selected_name = choices[0] if choices else ""
-            selected_item = None
-            for item in items:
-                if selected_name in item["name"] or item["name"] in selected_name:
-                    selected_item = item
-                    break
+            selected_name = first_choice
+            # Exact or case-insensitive name match first; option text may be
+            # truncated with "...", so fall back to a substring scan
+            name_index = {item["name"]: item for item in reversed(items)}
+            selected_item = name_index.get(selected_name)
+            if selected_item is None:
+                selected_lower = selected_name.lower()
+                selected_item = next(
+                    (item for item in items if item["name"].lower() == selected_lower),
+                    None
+                )
+            if selected_item is None:
+                for item in items:
+                    if selected_name in item["name"] or item["name"] in selected_name:
+                        selected_item = item
+                        break
             
             if selected_item:
                 real_world_context += f"PRIMARY SUBJECT:\n"
@@ -661,7 +910,7 @@ Return as JSON with "question" and "options" array."""
                 real_world_context += "\nUSE THESE EXACT DETAILS in the post. Mention the actual name, location, date, etc.\n"
             
             # Add other options as context
-            other_items = [item for item in items if item != selected_item][:3]
+            other_items = list(islice((item for item in items if item is not selected_item), 3))
             if other_items:
                 real_world_context += "\nRELATED OPTIONS (can mention as alternatives):\n"
                 for item in other_items:
@@ -675,7 +924,7 @@ Location: {location}
 Tone: {tone}
 
 User's Choices:
-{chr(10).join(f"- {choice}" for choice in choices)}
+{choices_block}
 
 {real_world_context}
 
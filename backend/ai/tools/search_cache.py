@@ -0,0 +1,33 @@
+"""
+Coalescing layer in front of the DuckDuckGo search tools.
+Concurrent sub-tasks often issue identical queries; the second caller awaits
+the first caller's in-flight search instead of hitting DDG again. Finished
+results are cached (once, with one TTL) by web_tools itself.
+"""
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from backend.ai.tools.web_tools import async_web_search, async_image_search
+
+_INFLIGHT: Dict[Tuple, asyncio.Task] = {}
+
+
+async def _coalesce(key: Tuple, call: Callable[[], Awaitable[str]]) -> str:
+    task = _INFLIGHT.get(key)
+    if task is None:
+        task = asyncio.create_task(call())
+        _INFLIGHT[key] = task
+        task.add_done_callback(lambda t: _INFLIGHT.pop(key, None))
+
+    # Shield so one caller being cancelled doesn't cancel the shared search
+    return await asyncio.shield(task)
+
+
+async def cached_web_search(queries: List[str]) -> str:
+    """Coalesced async_web_search."""
+    return await _coalesce(("web", tuple(queries)), lambda: async_web_search(queries))
+
+
+async def cached_image_search(query: str, max_results: int = 5) -> str:
+    """Coalesced async_image_search."""
+    return await _coalesce(("image", query, max_results), lambda: async_image_search(query, max_results))
@@ -1,10 +1,103 @@
-from typing import List
+from typing import List, Dict, Any, Optional, Tuple
 from ddgs import DDGS
 import requests
-from bs4 import BeautifulSoup
-import traceback
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from lxml import html as lxml_html
+import logging
 import asyncio
+import orjson
+import os
+import threading
+import time
+from collections import OrderedDict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from functools import partial
+from urllib.parse import urlsplit, urlunsplit
+
+from backend.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+# Caps concurrent DuckDuckGo searches so research fan-out stays under the
+# provider's rate limit instead of tripping 429 back-off
+_SEARCH_CONCURRENCY = int(os.getenv("AURA_SEARCH_CONCURRENCY", "8"))
+_SEARCH_SEMAPHORE = asyncio.Semaphore(_SEARCH_CONCURRENCY)
+
+# Short-lived results cache shared by the sync and async tools (which run
+# in worker threads, hence the lock). This is the only search-result cache;
+# search_cache.py just coalesces in-flight calls on top of it. Search results
+# and page text both live 1 minute; failures are never cached.
+_SEARCH_TTL = 60.0
+_PAGE_TTL = 60.0
+_TOOL_CACHE_MAX = 1024
+_TOOL_CACHE: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+_TOOL_CACHE_LOCK = threading.Lock()
+
+
+def _cache_get(key: Tuple, ttl: float) -> Any:
+    with _TOOL_CACHE_LOCK:
+        entry = _TOOL_CACHE.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= ttl:
+            del _TOOL_CACHE[key]
+            return None
+        _TOOL_CACHE.move_to_end(key)
+        return entry[1]
+
+
+def _cache_put(key: Tuple, value: Any) -> None:
+    with _TOOL_CACHE_LOCK:
+        _TOOL_CACHE[key] = (time.monotonic(), value)
+        _TOOL_CACHE.move_to_end(key)
+        if len(_TOOL_CACHE) > _TOOL_CACHE_MAX:
+            _TOOL_CACHE.popitem(last=False)
+
+# DDGS clients aren't documented as thread-safe, so each worker thread
+# keeps its own and reuses it across searches instead of building one per call
+_DDGS_LOCAL = threading.local()
+
+
+def _thread_ddgs() -> DDGS:
+    ddgs = getattr(_DDGS_LOCAL, "client", None)
+    if ddgs is None:
+        ddgs = _DDGS_LOCAL.client = DDGS()
+    return ddgs
+
+
+def _search_query(ddgs: DDGS, query: str) -> Dict[str, Any]:
+    """Run one DuckDuckGo text search and shape it as {query, results}"""
+    logger.debug("[Web Tools] Searching for: %s", query)
+    # Try with max_results=5 for better coverage
+    query_results = [
+        {
+            "title": res.get('title', ''),
+            "snippet": res.get('body', ''),
+            "url": res.get('href', '')
+        }
+        for res in ddgs.text(query, max_results=5) or ()
+    ]
+    
+    return {
+        "query": query,
+        "results": query_results
+    }
+
+
+def _search_one(query: str) -> Dict[str, Any]:
+    key = ("text", query)
+    cached = _cache_get(key, _SEARCH_TTL)
+    if cached is not None:
+        # Stored as JSON bytes so every caller gets its own copy
+        return orjson.loads(cached)
+    result = _search_query(_thread_ddgs(), query)
+    _cache_put(key, orjson.dumps(result))
+    return result
+
 
 def web_search(queries: List[str]) -> str:
     """
@@ -16,37 +109,214 @@ def web_search(queries: List[str]) -> str:
     Returns:
         A string containing the search results for each query.
     """
-    import json
-    results_data = []
+    if not queries:
+        return orjson.dumps([]).decode()
     
     try:
-        with DDGS() as ddgs:
-            for query in queries:
-                print(f"[Web Tools] Searching for: {query}")
-                # Try with max_results=5 for better coverage
-                results = list(ddgs.text(query, max_results=5))
-                
-                query_results = []
-                if results:
-                    for res in results:
-                        query_results.append({
-                            "title": res.get('title', ''),
-                            "snippet": res.get('body', ''),
-                            "url": res.get('href', '')
-                        })
-                
-                results_data.append({
-                    "query": query,
-                    "results": query_results
-                })
+        # Queries are independent round-trips, so run them side by side;
+        # each worker uses its own DDGS session
+        unique = list(dict.fromkeys(queries))
+        workers = min(len(unique), _SEARCH_CONCURRENCY)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            by_query = dict(zip(unique, pool.map(_search_one, unique)))
+        # Duplicate queries are searched once and repeated in input order
+        results_data = [by_query[q] for q in queries]
                 
     except Exception as e:
         error_msg = f"Error performing web search: {str(e)}"
-        print(f"[Web Tools] {error_msg}")
-        traceback.print_exc()
-        return json.dumps({"error": error_msg})
+        logger.exception("[Web Tools] %s", error_msg)
+        return orjson.dumps({"error": error_msg}).decode()
+
+    return orjson.dumps(results_data).decode()
+
+
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Keep-alive sessions for the synchronous reader, so repeat hosts skip the
+# TCP/TLS handshake; transient 429/5xx responses are retried briefly. Each
+# worker thread gets its own session so they don't contend on one pool lock.
+_SESSION_LOCAL = threading.local()
+
+
+def _session() -> requests.Session:
+    session = getattr(_SESSION_LOCAL, "session", None)
+    if session is None:
+        session = _SESSION_LOCAL.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504))
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    return session
+
+# Lazily created by _get_parse_pool; AURA_PARSE_WORKERS=0 keeps parsing in threads
+_PARSE_POOL: Optional[ProcessPoolExecutor] = None
+
+# Caps concurrent page fetches across all readers
+_READ_SEMAPHORE = asyncio.Semaphore(10)
+
+# Pages are read in 64 KiB chunks and cut off at 512 KiB, far more HTML than
+# the 10k characters of text kept per page; declared sizes above the hard
+# limit are not downloaded at all
+_READ_CHUNK_BYTES = 64 * 1024
+_MAX_PAGE_BYTES = 512 * 1024
+_MAX_CONTENT_LENGTH = 20 * 1024 * 1024
+# Characters of cleaned text kept per page
+_MAX_PAGE_CHARS = 10000
+# PDFs, images, JSON and the like are never handed to the HTML parser;
+# a missing Content-Type is given the benefit of the doubt
+_HTML_TYPES = frozenset({"text/html", "application/xhtml+xml", ""})
+
+# ETag/Last-Modified of recently read pages with the text extracted from
+# them, so re-reads send a conditional GET and reuse the text on a 304
+_HTTP_META_MAX = 256
+_HTTP_META: "OrderedDict[str, Tuple[str, str, str]]" = OrderedDict()
+
+# Non-text elements whose content must not reach the extracted text
+_DROP_NON_TEXT = etree.XPath("//script|//style|//noscript|//svg|//iframe|//template")
+
+
+def _looks_utf8(content: bytes) -> bool:
+    try:
+        content.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # The body may have been cut mid-character at the read cap
+        return e.start >= len(content) - 3
+    return True
+
+
+def _extract_text(content: bytes, encoding: Optional[str] = None) -> str:
+    """Readable text of an HTML page, one phrase per line"""
+    # Parse straight into an lxml tree; no soup wrapper objects are built
+    if not encoding and _looks_utf8(content):
+        # Without a declared charset or <meta> lxml assumes Latin-1
+        encoding = 'utf-8'
+    # A known charset gets its own parser, otherwise lxml's thread-local
+    # default parser detects the encoding from a <meta> tag
+    parser = lxml_html.HTMLParser(encoding=encoding) if encoding else None
+    doc = lxml_html.document_fromstring(content, parser=parser)
+    
+    for element in _DROP_NON_TEXT(doc):
+        element.drop_tree()  # keeps the element's tail text
+    
+    # <head> holds no readable content; fall back to the whole document
+    # when there is no <body>
+    body = doc.find('body')
+    root = body if body is not None else doc
+    
+    # Only the first _MAX_PAGE_CHARS of cleaned text are kept, so stop
+    # walking text nodes once that much is known to be complete. Cleaning a
+    # prefix gives a prefix of the full result except for its last phrase,
+    # which may have been cut off; that phrase is dropped before comparing.
+    pieces = []
+    size = 0
+    checkpoint = _MAX_PAGE_CHARS * 2
+    for piece in root.itertext():
+        pieces.append(piece)
+        size += len(piece)
+        if size >= checkpoint:
+            text = _clean_text(''.join(pieces))
+            complete = text[:text.rfind('\n')]
+            if len(complete) > _MAX_PAGE_CHARS:
+                return complete
+            checkpoint *= 2
+    return _clean_text(''.join(pieces))
+
+
+def _clean_text(raw: str) -> str:
+    """
+    One phrase per line: strip each line, split multi-headlines on double
+    spaces and drop blanks. Most lines are blank or have no double space,
+    so those skip the split and the per-phrase strip entirely.
+    """
+    phrases = []
+    append = phrases.append
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if "  " in line:
+            phrases.extend(p for p in map(str.strip, line.split("  ")) if p)
+        else:
+            append(line)
+    return '\n'.join(phrases)
+
+
+def _conditional_request(url: str) -> Tuple[Dict[str, str], Optional[str]]:
+    """Request headers for `url` plus the page text its validators belong to"""
+    with _TOOL_CACHE_LOCK:
+        meta = _HTTP_META.get(url)
+        if meta is not None:
+            _HTTP_META.move_to_end(url)
+    if meta is None:
+        return _HEADERS, None
+    etag, last_modified, page = meta
+    headers = dict(_HEADERS)
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    return headers, page
+
+
+def _remember_validators(url: str, response_headers, page: str) -> None:
+    etag = response_headers.get('ETag', '')
+    last_modified = response_headers.get('Last-Modified', '')
+    if not (etag or last_modified):
+        return
+    with _TOOL_CACHE_LOCK:
+        _HTTP_META[url] = (etag, last_modified, page)
+        _HTTP_META.move_to_end(url)
+        if len(_HTTP_META) > _HTTP_META_MAX:
+            _HTTP_META.popitem(last=False)
+
+
+def _non_html_type(headers) -> Optional[str]:
+    """The response's media type if it is not HTML (checked before any body is read)"""
+    ctype = headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+    return None if ctype in _HTML_TYPES else ctype
+
+
+def _check_content_length(headers) -> None:
+    length = headers.get('Content-Length')
+    if length and length.isdigit() and int(length) > _MAX_CONTENT_LENGTH:
+        raise ValueError(f"page too large ({int(length) // (1024 * 1024)} MiB)")
+
+
+_TRACKING_PARAMS = frozenset({"fbclid", "gclid"})
+
+
+def _is_tracking_param(pair: str) -> bool:
+    name = pair.split("=", 1)[0].lower()
+    return name.startswith("utm_") or name in _TRACKING_PARAMS
+
+
+def normalize_page_url(url: str) -> str:
+    """
+    Canonical form of a page URL, used both to fetch it and to dedupe it:
+    https:// added if missing, scheme/host lowercased, fragment and tracking
+    params (utm_*, fbclid, gclid) dropped. The rest of the query is kept as-is,
+    since it often identifies the page (?id=, ?v=, ?page=).
+    """
+    if not url.startswith('http'):
+        url = 'https://' + url
+    parts = urlsplit(url)
+    query = parts.query
+    if query and ("utm_" in query or "clid" in query):
+        query = "&".join(pair for pair in query.split("&") if not _is_tracking_param(pair))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def _format_page(url: str, text: str) -> str:
+    # Truncate if too long (to avoid context limit issues)
+    if len(text) > _MAX_PAGE_CHARS:
+        text = text[:_MAX_PAGE_CHARS] + "... [Truncated]"
+    return f"Content from {url}:\n{text}\n"
 
-    return json.dumps(results_data, indent=2)
 
 def web_page_reader(urls: List[str]) -> str:
     """
@@ -59,77 +329,233 @@ def web_page_reader(urls: List[str]) -> str:
         A string containing the content of each page.
     """
     contents = []
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    # Each distinct page is fetched once; duplicates reuse its text in place
+    seen: Dict[str, int] = {}
     
     for url in urls:
-        print(f"[Web Tools] Reading page: {url}")
+        key = normalize_page_url(url)
+        if key in seen:
+            contents.append(contents[seen[key]])
+            continue
+        seen[key] = len(contents)
+        url = key  # already has a scheme
+        
+        cache_key = ("page", url)
+        cached = _cache_get(cache_key, _PAGE_TTL)
+        if cached is not None:
+            contents.append(cached)
+            continue
+        
+        logger.debug("[Web Tools] Reading page: %s", url)
         try:
-            # Simple validation to ensure it's a URL
-            if not url.startswith('http'):
-                url = 'https://' + url
-                
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            headers, known_page = _conditional_request(url)
+            response = _session().get(url, headers=headers, timeout=(3.05, 10), stream=True)
+            if response.status_code == 304 and known_page is not None:
+                response.close()
+                _cache_put(cache_key, known_page)
+                contents.append(known_page)
+                continue
+            try:
+                response.raise_for_status()
+                skipped = _non_html_type(response.headers)
+                if skipped is not None:
+                    contents.append(f"Skipped {url}: non-HTML content ({skipped})")
+                    continue
+                _check_content_length(response.headers)
                 
-            # Get text
-            text = soup.get_text()
-            
-            # Break into lines and remove leading/trailing space on each
-            lines = (line.strip() for line in text.splitlines())
-            # Break multi-headlines into a line each
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            # Drop blank lines
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+                body = bytearray()
+                for chunk in response.iter_content(chunk_size=_READ_CHUNK_BYTES):
+                    body += chunk
+                    if len(body) >= _MAX_PAGE_BYTES:
+                        break
+            finally:
+                # Return the connection to the pool even if we stopped early
+                response.close()
             
-            # Truncate if too long (to avoid context limit issues)
-            if len(text) > 10000:
-                text = text[:10000] + "... [Truncated]"
-                
-            contents.append(f"Content from {url}:\n{text}\n")
+            # A charset declared by the server skips encoding detection;
+            # requests' ISO-8859-1 default for undeclared text/* is not trusted.
+            declared = 'charset=' in response.headers.get('Content-Type', '').lower()
+            text = _extract_text(bytes(body[:_MAX_PAGE_BYTES]), response.encoding if declared else None)
+            page = _format_page(url, text)
+            _cache_put(cache_key, page)
+            _remember_validators(url, response.headers, page)
+            contents.append(page)
             
         except Exception as e:
             error_msg = f"Error reading {url}: {str(e)}"
-            print(f"[Web Tools] {error_msg}")
+            logger.warning("[Web Tools] %s", error_msg)
             contents.append(error_msg)
             
     return "\n".join(contents)
 
 
-async def async_web_search(queries: List[str]) -> str:
+async def async_web_search(queries: List[str], timeout: float = 20.0) -> str:
     """
     Async wrapper for web_search that performs web searches using DuckDuckGo.
     
+    Each query runs concurrently in its own worker thread, so the total wait is
+    the slowest query rather than the sum. A query that fails or exceeds
+    `timeout` is dropped; an error is returned only if every query failed.
+    
     Args:
         queries: A list of search queries.
+        timeout: Per-query timeout in seconds.
         
     Returns:
         A JSON string containing the search results for each query.
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, web_search, queries)
+    loop = asyncio.get_running_loop()
+    
+    async def _one(query: str) -> Dict[str, Any]:
+        # Cache hits are served on the loop without a thread hop
+        cached = _cache_get(("text", query), _SEARCH_TTL)
+        if cached is not None:
+            return orjson.loads(cached)
+        # DDGS only has a blocking client, so the search itself still needs a thread
+        async with _SEARCH_SEMAPHORE:
+            return await asyncio.wait_for(loop.run_in_executor(None, _search_one, query), timeout)
+    
+    # Duplicate queries are searched once and repeated in input order
+    unique = list(dict.fromkeys(queries))
+    by_query = dict(zip(unique, await asyncio.gather(*[_one(q) for q in unique], return_exceptions=True)))
+    outcomes = [by_query[q] for q in queries]
+    results_data = [o for o in outcomes if not isinstance(o, BaseException)]
+    
+    if queries and not results_data:
+        error_msg = f"Error performing web search: {outcomes[0]!r}"
+        logger.warning("[Web Tools] %s", error_msg)
+        return orjson.dumps({"error": error_msg}).decode()
+    
+    return orjson.dumps(results_data).decode()
+
+
+def _get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """Process pool for HTML parsing, created on first use (never at import)"""
+    global _PARSE_POOL
+    if _PARSE_POOL is None:
+        workers = int(os.getenv("AURA_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+        if workers <= 0:
+            return None
+        # spawn, not fork: forking a process that runs an event loop and
+        # worker threads can copy held locks into the child
+        _PARSE_POOL = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _PARSE_POOL
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse worker processes (called on app shutdown)."""
+    global _PARSE_POOL
+    if _PARSE_POOL is not None:
+        _PARSE_POOL.shutdown(wait=False, cancel_futures=True)
+        _PARSE_POOL = None
+
+
+async def _parse_off_loop(content: bytes, encoding: Optional[str]) -> str:
+    """
+    Run _extract_text in a worker process so concurrent page parses use
+    separate cores instead of contending for this process's GIL. Falls back
+    to a thread when the pool is disabled or has died.
+    """
+    global _PARSE_POOL
+    pool = _get_parse_pool()
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, _extract_text, content, encoding)
+        except BrokenProcessPool:
+            logger.warning("[Web Tools] Parse pool died, falling back to threads")
+            _PARSE_POOL = None
+    return await asyncio.to_thread(_extract_text, content, encoding)
 
 
-async def async_web_page_reader(urls: List[str]) -> str:
+async def _read_page(url: str) -> str:
+    """Fetch one page and return its formatted text, or an error line"""
+    cache_key = ("page", url)
+    cached = _cache_get(cache_key, _PAGE_TTL)
+    if cached is not None:
+        return cached
+    
+    logger.debug("[Web Tools] Reading page: %s", url)
+    try:
+        # Simple validation to ensure it's a URL
+        if not url.startswith('http'):
+            url = 'https://' + url
+        
+        headers, known_page = _conditional_request(url)
+        body = bytearray()
+        async with _READ_SEMAPHORE:
+            async with get_http_client().stream("GET", url, headers=headers, timeout=10) as response:
+                if response.status_code == 304 and known_page is not None:
+                    _cache_put(cache_key, known_page)
+                    return known_page
+                response.raise_for_status()
+                skipped = _non_html_type(response.headers)
+                if skipped is not None:
+                    return f"Skipped {url}: non-HTML content ({skipped})"
+                _check_content_length(response.headers)
+                async for chunk in response.aiter_bytes(_READ_CHUNK_BYTES):
+                    body += chunk
+                    if len(body) >= _MAX_PAGE_BYTES:
+                        break
+        
+        # charset_encoding is only set when the server declared one
+        text = await _parse_off_loop(bytes(body[:_MAX_PAGE_BYTES]), response.charset_encoding)
+        page = _format_page(url, text)
+        _cache_put(cache_key, page)
+        _remember_validators(url, response.headers, page)
+        return page
+        
+    except Exception as e:
+        error_msg = f"Error reading {url}: {str(e)}"
+        logger.warning("[Web Tools] %s", error_msg)
+        return error_msg
+
+
+async def async_web_page_reader(
+    urls: List[str],
+    timeout: float = 15.0,
+    max_total_chars: Optional[int] = None
+) -> str:
     """
-    Async wrapper for web_page_reader that reads content from web pages.
+    Async counterpart of web_page_reader that reads content from web pages.
+    
+    Pages are fetched concurrently on the shared pooled HTTP client and only
+    the HTML parse runs in a worker thread; a page that exceeds `timeout` is
+    reported like any other read error instead of holding up the rest.
     
     Args:
         urls: A list of URLs to read.
+        timeout: Per-page timeout in seconds.
+        max_total_chars: If set, the combined content is cut to this length.
         
     Returns:
         A string containing the content of each page.
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, web_page_reader, urls)
+    async def _one(url: str) -> str:
+        try:
+            return await asyncio.wait_for(_read_page(url), timeout)
+        except asyncio.TimeoutError:
+            return f"Error reading {url}: timed out after {timeout:.0f}s"
+    
+    # Each distinct page is fetched once; duplicates reuse its text in place
+    unique = list(dict.fromkeys(normalize_page_url(url) for url in urls))
+    fetched = await asyncio.gather(*[_one(url) for url in unique])
+    by_key = dict(zip(unique, fetched))
+    pages = [by_key[normalize_page_url(url)] for url in urls]
+    if max_total_chars is None:
+        return "\n".join(pages)
+    
+    # Stop joining once the budget is used instead of building the full text
+    kept = []
+    remaining = max_total_chars
+    for page in pages:
+        if remaining < 0:
+            break
+        kept.append(page[:remaining])
+        remaining -= len(kept[-1]) + 1
+    return "\n".join(kept)[:max_total_chars]
 
 
 def image_search(query: str, max_results: int = 5) -> str:
@@ -143,36 +569,39 @@ def image_search(query: str, max_results: int = 5) -> str:
     Returns:
         JSON string containing image results with URLs, titles, and sources.
     """
-    import json
+    key = ("images", query, max_results)
+    cached = _cache_get(key, _SEARCH_TTL)
+    if cached is not None:
+        return cached
     
     try:
-        with DDGS() as ddgs:
-            print(f"[Web Tools] Image search for: {query}")
-            results = list(ddgs.images(query, max_results=max_results))
-            
-            image_results = []
-            for res in results:
-                image_results.append({
-                    "title": res.get('title', ''),
-                    "image_url": res.get('image', ''),
-                    "thumbnail_url": res.get('thumbnail', ''),
-                    "source_url": res.get('url', ''),
-                    "source": res.get('source', ''),
-                    "width": res.get('width', 0),
-                    "height": res.get('height', 0)
-                })
-            
-            print(f"[Web Tools] Found {len(image_results)} images")
-            return json.dumps({
-                "query": query,
-                "images": image_results
-            }, indent=2)
+        ddgs = _thread_ddgs()
+        logger.debug("[Web Tools] Image search for: %s", query)
+        image_results = [
+            {
+                "title": res.get('title', ''),
+                "image_url": res.get('image', ''),
+                "thumbnail_url": res.get('thumbnail', ''),
+                "source_url": res.get('url', ''),
+                "source": res.get('source', ''),
+                "width": res.get('width', 0),
+                "height": res.get('height', 0)
+            }
+            for res in ddgs.images(query, max_results=max_results) or ()
+        ]
+        
+        logger.debug("[Web Tools] Found %d images", len(image_results))
+        result = orjson.dumps({
+            "query": query,
+            "images": image_results
+        }).decode()
+        _cache_put(key, result)
+        return result
             
     except Exception as e:
         error_msg = f"Error performing image search: {str(e)}"
-        print(f"[Web Tools] {error_msg}")
-        traceback.print_exc()
-        return json.dumps({"error": error_msg})
+        logger.exception("[Web Tools] %s", error_msg)
+        return orjson.dumps({"error": error_msg}).decode()
 
 
 async def async_image_search(query: str, max_results: int = 5) -> str:
@@ -186,6 +615,13 @@ async def async_image_search(query: str, max_results: int = 5) -> str:
     Returns:
         JSON string containing image results.
     """
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(None, image_search, query, max_results)
+    # Cache hits are served on the loop without a thread hop
+    cached = _cache_get(("images", query, max_results), _SEARCH_TTL)
+    if cached is not None:
+        return cached
+    
+    # DDGS only has a blocking client, so the search itself still needs a thread
+    loop = asyncio.get_running_loop()
+    async with _SEARCH_SEMAPHORE:
+        return await loop.run_in_executor(None, image_search, query, max_results)
 
@@ -1,2 +1,63 @@
+import json
+from typing import Any, Dict, List
+
+
 def clean_json_string(s: str) -> str:
+    s = s.strip()
+    if s.startswith("```"):
+        # Common case: one fenced block; slice it out instead of rewriting the string
+        newline = s.find("\n")
+        if (newline != -1 and s[3:newline].rstrip() in ("", "json")
+                and s.endswith("```") and s.count("```") == 2):
+            return s[newline + 1:-3].strip()
+    elif "```" not in s:
+        return s
     return s.replace("```json\n", "").replace("\n```", "").replace("```", "").strip()
+
+
+class JsonArrayStreamParser:
+    """
+    Incrementally extracts complete elements of a top-level array field
+    (e.g. "sub_tasks") from a JSON object that arrives in text chunks.
+    """
+
+    def __init__(self, key: str):
+        self._marker = f'"{key}"'
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = -1  # Offset of the next array element, -1 until "[" is seen
+        self._done = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Add a chunk of text and return any array elements completed by it."""
+        self._buffer += chunk
+        items = []
+        if self._done:
+            return items
+
+        if self._pos < 0:
+            key_at = self._buffer.find(self._marker)
+            if key_at < 0:
+                return items
+            bracket_at = self._buffer.find("[", key_at + len(self._marker))
+            if bracket_at < 0:
+                return items
+            self._pos = bracket_at + 1
+
+        buf = self._buffer
+        while True:
+            pos = self._pos
+            while pos < len(buf) and buf[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(buf):
+                break
+            if buf[pos] == "]":
+                self._done = True
+                break
+            try:
+                item, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                break  # Element not complete yet
+            items.append(item)
+            self._pos = end
+        return items
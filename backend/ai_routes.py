@@ -1,26 +1,65 @@
 import os
 import io
 import json
-import base64
-from typing import List, Optional
+import time
+import random
+import asyncio
+from collections import OrderedDict
+import pybase64
+from typing import List, Optional, Tuple
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
 from google.genai import types 
 from backend.models import EntitySchema
 from backend.r2_utils import R2Utils
 from backend.ai.factory import get_text_provider, get_image_provider, get_r2_utils
 from backend.ai.interfaces import ReferenceImage
+from backend.ai.utils import clean_json_string
 from backend.cache_service import cache_service
+from backend.http_client import get_http_client
 from backend.database import collection
 from bson.objectid import ObjectId
 from dotenv import load_dotenv
 
 load_dotenv()
 
-router = APIRouter()
-
-def clean_json_string(s: str) -> str:
-    return s.replace("```json\n", "").replace("\n```", "").replace("```", "").strip()
+# orjson serializes the JSON-heavy AI payloads (POIs, news, slides) far faster than stdlib json
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Pools for the initiate-creation archetypes (sampled so the 4 panels stay diverse)
+_ARCHETYPE_GENDERS = ("Female", "Female", "Male", "Male", "Non-binary")
+_ARCHETYPE_AGES = ("18-22", "20-25", "25-30", "30-35", "35-40")
+_ARCHETYPE_ETHNICITIES = (
+    "Korean", "Japanese", "Chinese", "South Asian", "Southeast Asian", "Black",
+    "White", "Latino", "Middle Eastern", "Indigenous", "Pacific Islander", "Mixed"
+)
+_ARCHETYPE_LOOKS = (
+    "short curly hair, streetwear",
+    "long straight hair, minimalist neutral outfit",
+    "buzz cut, athletic wear",
+    "braids, bold colorful fashion",
+    "wavy shoulder-length hair, vintage thrifted style",
+    "sleek bun, smart casual blazer",
+    "messy bob, grunge layers",
+    "afro, relaxed linen outfit",
+    "undercut, techwear jacket",
+    "ponytail, sporty casual look",
+)
+
+def _sample_archetypes(count: int = 4) -> List[dict]:
+    genders = random.sample(_ARCHETYPE_GENDERS, count)
+    ethnicities = random.sample(_ARCHETYPE_ETHNICITIES, count)
+    looks = random.sample(_ARCHETYPE_LOOKS, count)
+    return [
+        {
+            "gender": genders[i],
+            "age_range": random.choice(_ARCHETYPE_AGES),
+            "ethnicity": ethnicities[i],
+            "look": looks[i],
+        }
+        for i in range(count)
+    ]
 
 class GeneratePersonaRequest(BaseModel):
     category: str = Field(..., alias="vibe")
@@ -89,6 +128,8 @@ class StoryGenerateRequest(BaseModel):
     setup_context: str
     choice: str
     reference_images: Optional[List[dict]] = None  # Future: [{"image_url": "...", "role": "product", "description": "..."}, ...]
+    # EntitySchema has no id; lets the stored avatar reference be looked up by _id
+    entity_id: Optional[str] = None
 
 class LocationPOIsRequest(BaseModel):
     location: str  # e.g., "New York City, USA"
@@ -109,7 +150,7 @@ async def get_location_pois(req: LocationPOIsRequest):
         cached = await cache_service.get_location_pois(req.location)
         if cached:
             print(f"[POI Cache HIT] Location: {req.location}")
-            return cached
+            return ORJSONResponse(content=cached)
         
         print(f"[POI Cache MISS] Fetching POIs via Places API for: {req.location}")
         
@@ -124,7 +165,7 @@ async def get_location_pois(req: LocationPOIsRequest):
         await cache_service.set_location_pois(req.location, result)
         print(f"[POI Cache SET] Cached {len(result.get('pois', []))} POIs for {req.location}")
         
-        return result
+        return ORJSONResponse(content=result)
         
     except HTTPException:
         raise
@@ -142,15 +183,49 @@ async def get_location_pois(req: LocationPOIsRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+# Coordinates don't change, so geocodes are kept for a long time per location
+_GEOCODE_TTL = 30 * 24 * 3600.0
+_GEOCODE_MAX = 4096
+_GEOCODE_CACHE: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+
+def _geocode_key(location: str) -> str:
+    return location.strip().lower()
+
+def _geocode_cache_get(location: str) -> Optional[dict]:
+    key = _geocode_key(location)
+    cached = _GEOCODE_CACHE.get(key)
+    if cached is None or time.monotonic() - cached[0] >= _GEOCODE_TTL:
+        return None
+    _GEOCODE_CACHE.move_to_end(key)
+    return {"location": location, "lat": cached[1]["lat"], "lng": cached[1]["lng"]}
+
+def _geocode_cache_put(item: dict) -> None:
+    key = _geocode_key(item["location"])
+    _GEOCODE_CACHE[key] = (time.monotonic(), {"lat": item["lat"], "lng": item["lng"]})
+    _GEOCODE_CACHE.move_to_end(key)
+    if len(_GEOCODE_CACHE) > _GEOCODE_MAX:
+        _GEOCODE_CACHE.popitem(last=False)
+
 @router.post("/geocode")
 async def geocode(req: GeocodeRequest):
     try:
         if not req.locations: return []
         unique = list(set([loc for loc in req.locations if loc]))
         
+        results = []
+        missing = []
+        for loc in unique:
+            hit = _geocode_cache_get(loc)
+            if hit:
+                results.append(hit)
+            else:
+                missing.append(loc)
+        if not missing:
+            return results
+        
         prompt = f"""
             I need the approximate geographic coordinates for the following locations:
-            {", ".join(unique)}
+            {", ".join(missing)}
             
             Return a valid JSON array of objects with location, lat, lng.
         """
@@ -171,13 +246,23 @@ async def geocode(req: GeocodeRequest):
                 }
             }
         )
-        return response
+        if isinstance(response, list):
+            # Only cache answers for locations we actually asked about
+            asked = {_geocode_key(loc) for loc in missing}
+            for item in response:
+                if isinstance(item, dict) and _geocode_key(item.get("location") or "") in asked:
+                    _geocode_cache_put(item)
+            results.extend(response)
+        return results
     except Exception as e:
         print(f"Geocoding error: {e}")
         return []
 
 
-@router.post("/generate-persona", response_model=EntitySchema)
+# Outgoing validation is skipped on the creation endpoints: the payloads are built
+# right here, so re-validating them only costs a full model traversal per response.
+# The schemas stay in `responses` for the OpenAPI docs.
+@router.post("/generate-persona", response_model=None, responses={200: {"model": EntitySchema}})
 async def generate_persona(req: GeneratePersonaRequest):
     try:
         # Build prompt with optional constraints
@@ -220,101 +305,62 @@ async def generate_persona(req: GeneratePersonaRequest):
         provider = get_text_provider()
         data = await provider.generate(prompt=prompt)
         
-        return EntitySchema(kind="influencer", data=data)
+        return EntitySchema.construct(kind="influencer", data=data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/initiate-creation", response_model=InitiateCreationResponse)
+@router.post("/initiate-creation", response_model=None, responses={200: {"model": InitiateCreationResponse}})
 async def initiate_creation(req: InitiateCreationRequest):
     try:
-        from backend.image_utils import split_grid_image
-        
-        # 1. Generate 4 Diverse Concept Options using LLM
-        location_context = f" based in {req.location}" if req.location else ""
-        concept_prompt = f"""
-        Generate 4 distinct character concepts for a digital influencer who specializes as a "{req.category}"{location_context}.
-        Ensure high diversity in gender, ethnicity, and style.
-        The characters should feel like professional or aspiring "{req.category}" influencers authentic to the location "{req.location if req.location else 'their environment'}".
-        
-        Return JSON array of 4 objects:
-        - gender: e.g. Female, Male, Non-binary
-        - age_range: e.g. 20-25
-        - ethnicity: e.g. Korean, Black, White, Latino
-        - visualSummary: A concise visual description of this specific character's appearance (face, hair, style). Max 20 words.
-        """
+        from backend.image_utils import split_grid_image_from_bytes
         
-        text_provider = get_text_provider()
-        concepts_response = await text_provider.generate(
-            prompt=concept_prompt,
-            schema={
-                "type": "ARRAY",
-                "items": {
-                    "type": "OBJECT",
-                    "properties": {
-                        "gender": {"type": "STRING"},
-                        "age_range": {"type": "STRING"},
-                        "ethnicity": {"type": "STRING"},
-                        "visualSummary": {"type": "STRING"}
-                    },
-                    "required": ["gender", "age_range", "ethnicity", "visualSummary"]
-                }
-            }
-        )
-        
-        concepts = []
-        if isinstance(concepts_response, list):
-             concepts = concepts_response
-        else:
-             # Fallback if structure is weird, though generate usually handles it
-             concepts = [{"visualSummary": req.vibe, "gender": "Any", "age_range": "Any", "ethnicity": "Any"}] * 4
-             
-        # Ensure we have 4 concepts
-        if len(concepts) < 4:
-            concepts = (concepts * 4)[:4]
-
-        # 2. Generate Grid Image
-        # Construct a composed prompt
+        # 1. Pick 4 diverse archetypes locally so the grid can start rendering right away
+        archetypes = _sample_archetypes()
         location_str = f" in {req.location}" if req.location else ""
+        
         grid_prompt = (
             f"Split into a 2x2 grid. Four REALISTIC SMARTPHONE photos of digital influencers who are experts in: {req.category}{location_str}. "
             f"Show them in environments relevant to being a {req.category}. "
             "Style: Shot on iPhone, flash photography, candid, grainy, amateur composition, social media quality. "
             "Distinct characters in each panel:\n"
         )
-        for idx, c in enumerate(concepts):
-            grid_prompt += f"Panel {idx+1}: {c['gender']}, {c['ethnicity']}, {c['visualSummary']}. "
+        for idx, a in enumerate(archetypes):
+            grid_prompt += f"Panel {idx+1}: {a['gender']}, {a['age_range']}, {a['ethnicity']}, {a['look']}. "
         
+        # 2. Render the grid; each panel's summary is exactly what it was prompted with,
+        # so nothing describes details the image was never asked to show
         image_provider = get_image_provider()
         grid_image_result = await image_provider.generate_image(prompt=grid_prompt)
         grid_image_url = grid_image_result.get('url') if isinstance(grid_image_result, dict) else grid_image_result
 
         if not grid_image_url:
              raise Exception("Failed to generate grid image")
-             
+        
         # 3. Split using helper
-        image_urls = split_grid_image(grid_image_url)
+        grid_bytes = await _grid_image_bytes(grid_image_result)
+        image_urls = await asyncio.to_thread(split_grid_image_from_bytes, grid_bytes)
         
         # 4. Map back to options
         options = []
         for i, url in enumerate(image_urls):
-            if i >= len(concepts): break
-            c = concepts[i]
-            options.append(AvatarOption(
-                imageUrl=url,
-                gender=c.get('gender', 'Any'),
-                age_range=c.get('age_range', 'Any'),
-                ethnicity=c.get('ethnicity', 'Any'),
-                visualSummary=c.get('visualSummary', '')
-            ))
+            if i >= len(archetypes): break
+            a = archetypes[i]
+            options.append({
+                "imageUrl": url,
+                "gender": a['gender'],
+                "age_range": a['age_range'],
+                "ethnicity": a['ethnicity'],
+                "visualSummary": a['look']
+            })
             
-        return InitiateCreationResponse(options=options)
+        # Plain str fields only, so orjson can write it without jsonable_encoder
+        return ORJSONResponse(content={"options": options})
 
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
-
 # DEPRECATED: Use DirectorModal with /director/start and /director/turn instead
 # @router.post("/generate-image")
 # async def generate_image(req: GenerateImageRequest):
@@ -364,7 +410,7 @@ async def current_news(req: CurrentNewsRequest):
         # Check cache
         cached = await cache_service.get_content(location, niche, cache_key_type)
         if cached:
-            return cached
+            return ORJSONResponse(content=cached)
 
         prompt = f"""
             Find 4 trending news stories RIGHT NOW {context} relevant to a {traits} influencer.
@@ -384,19 +430,19 @@ async def current_news(req: CurrentNewsRequest):
              news = json.loads(text)
         except: pass
 
-        sources = []
+        sources = {}
         if response.candidates and response.candidates[0].grounding_metadata and response.candidates[0].grounding_metadata.grounding_chunks:
              for chunk in response.candidates[0].grounding_metadata.grounding_chunks:
-                if chunk.web:
-                    sources.append({"title": chunk.web.title, "uri": chunk.web.uri})
+                if chunk.web and chunk.web.uri not in sources:
+                    sources[chunk.web.uri] = {"title": chunk.web.title, "uri": chunk.web.uri}
 
-        unique_sources = list({s['uri']: s for s in sources}.values())
+        unique_sources = list(sources.values())
         result = {"news": news, "sources": unique_sources}
         
         # Update cache
         await cache_service.set_content(location, niche, cache_key_type, result)
         
-        return result
+        return ORJSONResponse(content=result)
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -416,6 +462,58 @@ async def upload_file(file: UploadFile = File(...)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _grid_image_bytes(grid_image_result) -> bytes:
+    """
+    Raw bytes of a generated grid image. Providers that already hand back the
+    bytes (Gemini) skip the download; URL-only providers (Fal) are fetched once
+    over the shared client instead of through a blocking requests call.
+    """
+    if isinstance(grid_image_result, dict):
+        if grid_image_result.get('data'):
+            return grid_image_result['data']
+        url = grid_image_result.get('url')
+    else:
+        url = grid_image_result
+    
+    if url.startswith("data:"):
+        return await asyncio.to_thread(pybase64.b64decode, url.split(",", 1)[1])
+    
+    response = await get_http_client().get(url)
+    response.raise_for_status()
+    return response.content
+
+async def _fetch_avatar_reference(avatar_url: str, data: dict, entity_id: Optional[str] = None) -> Optional[ReferenceImage]:
+    """Download and shrink the influencer avatar (to reduce token usage) as reference [1]."""
+    try:
+        from backend.avatar_reference import get_avatar_reference
+        
+        # Influencers keep a pre-resized copy server-side once their avatar is set
+        reference_b64 = await get_avatar_reference(entity_id, avatar_url) if entity_id else None
+        if reference_b64:
+            print("[Story Gen] Using stored avatar reference")
+        else:
+            from backend.image_utils import resize_avatar_reference
+            
+            response = await get_http_client().get(avatar_url)
+            if response.status_code != 200:
+                print(f"[Story Gen] Failed to fetch avatar: {response.status_code}")
+                return None
+            
+            # PIL decode + LANCZOS resample would stall the event loop
+            resized_bytes = await asyncio.to_thread(resize_avatar_reference, response.content)
+            reference_b64 = f"data:image/jpeg;base64,{pybase64.b64encode_as_string(resized_bytes)}"
+            print(f"[Story Gen] Added reference [1]: Main character ({len(resized_bytes)} bytes)")
+        
+        return ReferenceImage(
+            image_data=reference_b64,
+            label="[1]",
+            role="character",
+            description=f"Main character: {data.get('name')} ({data.get('visualDescription', 'influencer')})"
+        )
+    except Exception as e:
+        print(f"[Story Gen] Error fetching avatar: {e}")
+        return None
+
 # DEPRECATED: Use DirectorModal with /director/start and /director/turn then /story-generate instead
 # @router.post("/story-setup")
 # async def story_setup(req: StorySetupRequest):
@@ -502,6 +600,10 @@ async def story_generate(req: StoryGenerateRequest):
                 - DO NOT describe facial features, hair color, or body type - those come from the reference image.
             """
 
+        # Fetch the avatar while the story text is generated; both are independent
+        avatar_url = data.get('avatarUrl', '')
+        avatar_task = asyncio.create_task(_fetch_avatar_reference(avatar_url, data, req.entity_id)) if avatar_url else None
+
         provider = get_text_provider()
         text_response = await provider.generate(
             prompt=prompt,
@@ -530,53 +632,14 @@ async def story_generate(req: StoryGenerateRequest):
             pass # Or duplicate
         slides_text = slides_text[:4] # Limit to 4
 
-        # 2. Fetch and prepare reference images
+        # 2. Collect reference images
         reference_images_list = []
         
         # Always include the influencer's avatar as reference [1]
-        avatar_url = data.get('avatarUrl', '')
-        if avatar_url:
-            try:
-                import httpx
-                from PIL import Image
-                import io
-                
-                async with httpx.AsyncClient(timeout=30.0) as client:
-                    response = await client.get(avatar_url)
-                    if response.status_code == 200:
-                        # Resize image to reduce token usage
-                        image_bytes = response.content
-                        img = Image.open(io.BytesIO(image_bytes))
-                        
-                        # Resize to max 512px on longest side
-                        max_size = 512
-                        ratio = min(max_size / img.width, max_size / img.height)
-                        if ratio < 1:
-                            new_size = (int(img.width * ratio), int(img.height * ratio))
-                            img = img.resize(new_size, Image.Resampling.LANCZOS)
-                            print(f"[Story Gen] Resized avatar from {len(image_bytes)} to {new_size}")
-                        
-                        # Convert to JPEG and encode
-                        buffer = io.BytesIO()
-                        img.convert('RGB').save(buffer, format='JPEG', quality=85)
-                        resized_bytes = buffer.getvalue()
-                        
-                        encoded = base64.b64encode(resized_bytes).decode('utf-8')
-                        reference_image_b64 = f"data:image/jpeg;base64,{encoded}"
-                        
-                        # Create ReferenceImage object
-                        ref_img = ReferenceImage(
-                            image_data=reference_image_b64,
-                            label="[1]",
-                            role="character",
-                            description=f"Main character: {data.get('name')} ({data.get('visualDescription', 'influencer')})"
-                        )
-                        reference_images_list.append(ref_img)
-                        print(f"[Story Gen] Added reference [1]: Main character ({len(resized_bytes)} bytes)")
-                    else:
-                        print(f"[Story Gen] Failed to fetch avatar: {response.status_code}")
-            except Exception as e:
-                print(f"[Story Gen] Error fetching avatar: {e}")
+        if avatar_task:
+            ref_img = await avatar_task
+            if ref_img:
+                reference_images_list.append(ref_img)
         
         # Future: Add additional reference images from request
         # if req.reference_images:
@@ -675,21 +738,15 @@ async def story_generate(req: StoryGenerateRequest):
             grid_image_result = await image_provider.generate_image(prompt=grid_prompt_fallback)
         
         grid_image_url = grid_image_result.get('url') if isinstance(grid_image_result, dict) else grid_image_result
-        grid_image_data = grid_image_result.get('data') if isinstance(grid_image_result, dict) else None
         
         if not grid_image_url:
             raise Exception("Failed to generate grid image")
 
         # 4. Split the Image
-        # Use raw data if available to avoid DNS issues with R2 URLs
-        if grid_image_data:
-            from backend.image_utils import split_grid_image_from_bytes
-            print(f"[Story Gen] Splitting grid from raw data ({len(grid_image_data)} bytes)")
-            local_urls = split_grid_image_from_bytes(grid_image_data)
-        else:
-            from backend.image_utils import split_grid_image
-            print(f"[Story Gen] Splitting grid from URL: {grid_image_url}")
-            local_urls = split_grid_image(grid_image_url)
+        from backend.image_utils import split_grid_image_from_bytes
+        grid_image_data = await _grid_image_bytes(grid_image_result)
+        print(f"[Story Gen] Splitting grid from raw data ({len(grid_image_data)} bytes)")
+        local_urls = await asyncio.to_thread(split_grid_image_from_bytes, grid_image_data)
 
         
         final_slides = []
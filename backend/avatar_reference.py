@@ -0,0 +1,55 @@
+"""
+Pre-resized avatar references for image generation.
+The 512px JPEG sent to the image model as reference [1] is built once when an
+influencer's avatar is set, and kept on the entity outside `data` so it never
+ships with entity responses.
+"""
+import asyncio
+from typing import Optional
+
+import pybase64
+from bson import ObjectId
+
+from backend.database import entities_collection
+from backend.http_client import get_http_client
+from backend.image_utils import resize_avatar_reference
+
+
+async def store_avatar_reference(influencer_id: str, avatar_url: str) -> None:
+    """
+    Background task: fetch and resize the avatar, then store it as
+    `avatar_ref` ({source, image_data}) on the influencer entity.
+    Failures are only logged; readers fall back to resizing on demand.
+    """
+    try:
+        response = await get_http_client().get(avatar_url)
+        response.raise_for_status()
+        resized_bytes = await asyncio.to_thread(resize_avatar_reference, response.content)
+
+        # Only store it if the avatar hasn't been changed again in the meantime
+        await entities_collection.update_one(
+            {"_id": ObjectId(influencer_id), "data.avatarUrl": avatar_url},
+            {
+                "$set": {
+                    "avatar_ref": {
+                        "source": avatar_url,
+                        "image_data": f"data:image/jpeg;base64,{pybase64.b64encode_as_string(resized_bytes)}"
+                    }
+                }
+            }
+        )
+        print(f"[Avatar Ref] Stored avatar reference for {influencer_id} ({len(resized_bytes)} bytes)")
+    except Exception as e:
+        print(f"[Avatar Ref] Avatar reference failed for {influencer_id}: {e}")
+
+
+async def get_avatar_reference(influencer_id: str, avatar_url: str) -> Optional[str]:
+    """Stored reference data URI for this avatar, or None if missing or stale."""
+    entity = await entities_collection.find_one(
+        {"_id": ObjectId(influencer_id), "kind": "influencer"},
+        {"avatar_ref": 1}
+    )
+    ref = (entity or {}).get("avatar_ref") or {}
+    if ref.get("source") != avatar_url:
+        return None
+    return ref.get("image_data")
@@ -0,0 +1,34 @@
+"""
+Shared outbound HTTP client.
+Reuses pooled keep-alive connections across requests instead of paying a
+TCP+TLS handshake for every image download.
+"""
+from typing import Optional
+import httpx
+
+_HTTP: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _HTTP
+    if _HTTP is None or _HTTP.is_closed:
+        _HTTP = httpx.AsyncClient(
+            timeout=httpx.Timeout(30.0),
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=20,
+                keepalive_expiry=300
+            ),
+            follow_redirects=True,
+            http2=True
+        )
+    return _HTTP
+
+
+async def close_http_client() -> None:
+    """Close the shared client (called on app shutdown)."""
+    global _HTTP
+    if _HTTP is not None:
+        await _HTTP.aclose()
+        _HTTP = None
@@ -1,6 +1,7 @@
 import requests
 from PIL import Image, ImageFilter
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 import uuid
 import os
 from typing import List, Optional, Tuple
@@ -190,6 +191,37 @@ def split_grid_image_from_bytes(image_data: bytes) -> List[str]:
         raise e
 
 
+def resize_avatar_reference(image_bytes: bytes, max_size: int = 512) -> bytes:
+    """
+    Downscales an avatar to max_size on its longest side and re-encodes it as
+    JPEG, the form sent to the image model as a character reference.
+    CPU bound - call it off the event loop.
+    """
+    img = Image.open(BytesIO(image_bytes))
+    
+    ratio = min(max_size / img.width, max_size / img.height)
+    if ratio < 1:
+        new_size = (int(img.width * ratio), int(img.height * ratio))
+        # JPEGs can be decoded straight at a reduced DCT scale; keeping at least 2x
+        # the target leaves LANCZOS enough pixels and skips most of the decode work
+        img.draft(None, (new_size[0] * 2, new_size[1] * 2))
+        img = img.resize(new_size, Image.Resampling.LANCZOS)
+        print(f"[Image Utils] Resized avatar from {len(image_bytes)} bytes to {new_size}")
+    
+    buf = BytesIO()
+    img.convert('RGB').save(buf, format='JPEG', quality=85)
+    return buf.getvalue()
+
+
+_ENCODE_POOL = ThreadPoolExecutor(max_workers=min(6, os.cpu_count() or 1), thread_name_prefix="panel-encode")
+
+
+def _encode_jpeg(panel: Image.Image) -> bytes:
+    buf = BytesIO()
+    panel.save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
 def split_grid_flexible(image_bytes: bytes, rows: int, cols: int) -> List[bytes]:
     """
     Splits a grid image into panels based on rows and columns.
@@ -207,14 +239,17 @@ def split_grid_flexible(image_bytes: bytes, rows: int, cols: int) -> List[bytes]
     """
     try:
         img = Image.open(BytesIO(image_bytes))
+        # Decode once up front; every crop below reads from this buffer
+        img.load()
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
         width, height = img.size
         
         panel_width = width // cols
         panel_height = height // rows
         
-        panels = []
-        
         # Iterate in reading order: top to bottom, left to right
+        crops = []
         for row in range(rows):
             for col in range(cols):
                 x1 = col * panel_width
@@ -222,12 +257,11 @@ def split_grid_flexible(image_bytes: bytes, rows: int, cols: int) -> List[bytes]
                 x2 = x1 + panel_width
                 y2 = y1 + panel_height
                 
-                panel = img.crop((x1, y1, x2, y2))
-                
-                buf = BytesIO()
-                panel.save(buf, format="JPEG", quality=90)
-                buf.seek(0)
-                panels.append(buf.getvalue())
+                crops.append(img.crop((x1, y1, x2, y2)))
+        
+        # JPEG encoding dominates and Pillow releases the GIL while encoding,
+        # so encode the panels in parallel
+        panels = list(_ENCODE_POOL.map(_encode_jpeg, crops))
         
         print(f"[Image Utils] Split {rows}x{cols} grid into {len(panels)} panels")
         return panels
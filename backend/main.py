@@ -1,8 +1,27 @@
+import os
+import queue
+import logging
+import logging.handlers
 from fastapi import FastAPI, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from backend.auth import router as AuthRouter
 from backend.sse_manager import sse_manager
+from backend.http_client import close_http_client
+from backend.ai.tools.web_tools import shutdown_parse_pool
+
+# Debug-level logs are formatted lazily, so they cost nothing unless enabled.
+# Records are handed to a background thread through a queue so handlers never
+# block the event loop on a stdout write.
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_handler)
+logging.basicConfig(
+    level=os.getenv("AURA_LOG_LEVEL", "INFO").upper(),
+    handlers=[logging.handlers.QueueHandler(_log_queue)]
+)
+_log_listener.start()
 
 app = FastAPI(title="Aura AI Influencer Studio")
  
@@ -34,6 +53,26 @@ app.include_router(PostingsRouter, tags=["Postings"], prefix="/postings")
 app.include_router(CreationRouter, tags=["Creation"], prefix="/creation")
 app.include_router(OrchestratorRouter, tags=["Orchestrator"], prefix="")
 
+@app.on_event("startup")
+async def check_r2_config():
+    # Surface a missing R2 config once at boot instead of on every post
+    from backend.ai.factory import get_r2_utils
+    if get_r2_utils() is None:
+        logging.getLogger(__name__).warning("R2 is not configured; generated posts will be returned as a single grid slide")
+
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    await close_http_client()
+
+@app.on_event("shutdown")
+async def shutdown_web_tools_parse_pool():
+    shutdown_parse_pool()
+
+@app.on_event("shutdown")
+async def shutdown_log_listener():
+    _log_listener.stop()
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to Aura AI Influencer Studio API"}
@@ -17,7 +17,7 @@ from backend.ai.content_orchestrator import ContentOrchestrator
 from backend.ai.post_generator import generate_post_from_selections
 from backend.sse_manager import sse_manager
 import uuid
-import base64
+import pybase64
 
 router = APIRouter()
 
@@ -55,7 +55,13 @@ async def planning_background_task(session_id: str, query: str, post_type_hint:
         })
         
         orchestrator = ContentOrchestrator()
-        sub_tasks = await orchestrator.create_research_plan(query, post_type_hint, influencer_data)
+        sub_tasks = []
+        # Surface each sub-task as soon as the planner finishes emitting it
+        async for sub_task in orchestrator.stream_research_plan(query, post_type_hint, influencer_data):
+            sub_tasks.append(sub_task)
+            await sse_manager.broadcast(channel, "orch_plan_task", {
+                "sub_task": {"id": sub_task.id, "name": sub_task.name, "queries": sub_task.queries}
+            })
         
         # Update session
         if session_id in orchestrator_sessions:
@@ -195,7 +201,7 @@ async def generation_background_task(session_id: str, influencer_data: Dict[str,
         async with httpx.AsyncClient(timeout=30.0) as client:
             response = await client.get(avatar_url)
             response.raise_for_status()
-            raw_b64 = base64.b64encode(response.content).decode('utf-8')
+            raw_b64 = pybase64.b64encode_as_string(response.content)
             avatar_b64 = f"data:image/jpeg;base64,{raw_b64}"
         
         await sse_manager.broadcast(channel, "orch_generating", {
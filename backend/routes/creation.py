@@ -16,6 +16,7 @@ from backend.creation_session import (
 from backend.auth import get_current_user
 from backend.ai.factory import get_image_provider, get_text_provider, get_r2_utils
 from backend.image_utils import split_grid_image_from_bytes
+from backend.avatar_reference import store_avatar_reference
 from backend.r2_utils import R2Utils
 from backend.sse_manager import sse_manager
 import uuid
@@ -420,6 +421,7 @@ async def select_avatar(
 @router.post("/{session_id}/confirm", response_description="Confirm and create influencer")
 async def confirm_creation(
     session_id: str,
+    background_tasks: BackgroundTasks,
     updates: Optional[CreationSessionUpdate] = None,
     user_id: str = Depends(get_current_user)
 ):
@@ -478,6 +480,9 @@ async def confirm_creation(
     result = await entities_collection.insert_one(influencer_entity)
     influencer_id = str(result.inserted_id)
     
+    if influencer_data["avatarUrl"]:
+        background_tasks.add_task(store_avatar_reference, influencer_id, influencer_data["avatarUrl"])
+    
     # Update session as complete
     await creation_sessions_collection.update_one(
         {"_id": ObjectId(session_id)},
@@ -1,14 +1,15 @@
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, BackgroundTasks
 from backend.database import entities_collection, entity_helper
 from backend.models import EntitySchema, UpdateEntitySchema, ResponseModel, ErrorResponseModel
 from backend.auth import get_current_user
+from backend.avatar_reference import store_avatar_reference
 from bson import ObjectId
 from datetime import datetime
 
 router = APIRouter()
 
 @router.post("/", response_description="Add new influencer")
-async def add_influencer(user_id: str = Depends(get_current_user), influencer: dict = Body(...)):
+async def add_influencer(background_tasks: BackgroundTasks, user_id: str = Depends(get_current_user), influencer: dict = Body(...)):
     new_entity = {
         "kind": "influencer",
         "data": influencer,
@@ -17,6 +18,8 @@ async def add_influencer(user_id: str = Depends(get_current_user), influencer: d
         "updated_at": datetime.utcnow()
     }
     inserted = await entities_collection.insert_one(new_entity)
+    if influencer.get("avatarUrl"):
+        background_tasks.add_task(store_avatar_reference, str(inserted.inserted_id), influencer["avatarUrl"])
     new_influencer = await entities_collection.find_one({"_id": inserted.inserted_id})
     return ResponseModel(entity_helper(new_influencer), "Influencer added successfully.")
 
@@ -35,7 +38,7 @@ async def get_influencer_data(id: str, user_id: str = Depends(get_current_user))
     return ErrorResponseModel("An error occurred.", 404, "Influencer doesn't exist.")
 
 @router.put("/{id}")
-async def update_influencer_data(id: str, req: UpdateEntitySchema = Body(...), user_id: str = Depends(get_current_user)):
+async def update_influencer_data(id: str, background_tasks: BackgroundTasks, req: UpdateEntitySchema = Body(...), user_id: str = Depends(get_current_user)):
     req_dict = {k: v for k, v in req.data.items() if v is not None}
     update_data = {"data." + k: v for k, v in req_dict.items()}
     update_data["updated_at"] = datetime.utcnow()
@@ -43,6 +46,8 @@ async def update_influencer_data(id: str, req: UpdateEntitySchema = Body(...), u
     updated_influencer = await entities_collection.update_one(
         {"_id": ObjectId(id), "kind": "influencer", "owner_id": user_id}, {"$set": update_data}
     )
+    if updated_influencer.matched_count and req_dict.get("avatarUrl"):
+        background_tasks.add_task(store_avatar_reference, id, req_dict["avatarUrl"])
     if updated_influencer:
         return ResponseModel(f"Influencer with ID: {id} updated", "Influencer data updated successfully.")
     return ErrorResponseModel("An error occurred", 404, "Influencer not found.")
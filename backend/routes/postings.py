@@ -15,7 +15,7 @@ import uuid
 from io import BytesIO
 from PIL import Image
 import httpx
-import base64
+import pybase64
 
 router = APIRouter()
 
@@ -146,7 +146,7 @@ async def generate_post_content(posting_id: str, influencer_id: str, prompt: str
         # Prepare avatar as reference image
         from backend.ai.interfaces import ReferenceImage
         import httpx
-        import base64
+        import pybase64
         from PIL import Image as PILImage
         from io import BytesIO as IOBytesIO
         
@@ -177,7 +177,7 @@ async def generate_post_content(posting_id: str, influencer_id: str, prompt: str
             img.convert('RGB').save(buffer, format='JPEG', quality=90)
             resized_bytes = buffer.getvalue()
             
-            encoded = base64.b64encode(resized_bytes).decode('utf-8')
+            encoded = pybase64.b64encode_as_string(resized_bytes)
             reference_image_b64 = f"data:image/jpeg;base64,{encoded}"
             
             ref_img = ReferenceImage(
@@ -205,7 +205,7 @@ async def generate_post_content(posting_id: str, influencer_id: str, prompt: str
                             resp = await client.get(url)
                             if resp.status_code == 200:
                                 # Encode
-                                encoded = base64.b64encode(resp.content).decode('utf-8')
+                                encoded = pybase64.b64encode_as_string(resp.content)
                                 ref_data = f"data:image/jpeg;base64,{encoded}"
                             else:
                                 print(f"Failed to fetch reference image: {url}")
@@ -480,7 +480,7 @@ async def generate_videos_background(posting_id: str, influencer_id: str, durati
             grid_buffer.seek(0)
             grid_bytes = grid_buffer.getvalue()
             
-            grid_b64 = base64.b64encode(grid_bytes).decode('utf-8')
+            grid_b64 = pybase64.b64encode_as_string(grid_bytes)
             grid_url = f"data:image/png;base64,{grid_b64}"
             
             print(f"[VideoGeneration] Created 2x2 grid image: {grid_img.size}")
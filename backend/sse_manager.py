@@ -3,7 +3,7 @@ Server-Sent Events (SSE) Manager for real-time updates.
 Handles connection tracking, event broadcasting, and automatic cleanup.
 """
 import asyncio
-import json
+import orjson
 from typing import Dict, Set, Any, Optional
 from fastapi import Request
 from fastapi.responses import StreamingResponse
@@ -12,6 +12,11 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def _dumps(obj: Any) -> str:
+    """Serialize an event payload; orjson also accepts non-str keys like json did"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 class SSEManager:
     """Manages SSE connections and broadcasts events to subscribed clients."""
     
@@ -121,7 +126,7 @@ class SSEManager:
         
         try:
             # Send initial connection event
-            yield f"event: connected\ndata: {json.dumps({'resources': resource_ids})}\n\n"
+            yield f"event: connected\ndata: {_dumps({'resources': resource_ids})}\n\n"
             
             while True:
                 # Check if client disconnected
@@ -135,7 +140,7 @@ class SSEManager:
                     
                     # Format as SSE message
                     event_type = event.get("event", "message")
-                    event_data = json.dumps({
+                    event_data = _dumps({
                         "resource_id": event["resource_id"],
                         "data": event["data"]
                     })
@@ -216,6 +216,9 @@ export const OrchestratorFlow: React.FC<OrchestratorFlowProps> = ({
         case "orch_planning":
           setStatusMsg(data?.message ?? "Planning research…");
           break;
+        case "orch_plan_task":
+          if (data?.sub_task?.name) setStatusMsg(`Planned: ${data.sub_task.name}`);
+          break;
         case "orch_plan_ready":
           refreshSession();
           setCurrentStep(2);
@@ -378,6 +378,7 @@ export type SSEEventType =
   | 'agent_question'
   | 'agent_complete'
   | 'orch_planning'
+  | 'orch_plan_task'
   | 'orch_plan_ready'
   | 'orch_researching'
   | 'orch_research_ready'
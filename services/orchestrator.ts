@@ -109,6 +109,7 @@ export async function resetSession(
 // SSE Event Types (re-exported for backward compatibility)
 export type OrchestratorEventType =
   | 'orch_planning'
+  | 'orch_plan_task'
   | 'orch_plan_ready'
   | 'orch_researching'
   | 'orch_research_ready'
@@ -280,6 +280,7 @@ export class SSEManager {
     // Handle orchestrator events
     const orchEvents: SSEEventType[] = [
       'orch_planning',
+      'orch_plan_task',
       'orch_plan_ready',
       'orch_researching',
       'orch_research_ready',